@@ -0,0 +1,42 @@
+"""Notification invitation link
+
+Revision ID: 182e05bb49f3
+Revises: cc5546a60603
+Create Date: 2026-10-18 13:25:42.908986
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '182e05bb49f3'
+down_revision: Union[str, Sequence[str], None] = 'cc5546a60603'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('notifications', sa.Column('invitation_id', sa.UUID(), nullable=True))
+    op.create_foreign_key(
+        'notifications_invitation_id_fkey', 'notifications', 'team_invitations',
+        ['invitation_id'], ['id'], ondelete='CASCADE'
+    )
+    op.create_index(op.f('ix_notifications_invitation_id'), 'notifications', ['invitation_id'], unique=False)
+    # Backfill: enlazamos las TEAM_INVITE existentes por el token guardado en data
+    op.execute("""
+        UPDATE notifications n
+        SET invitation_id = i.id
+        FROM team_invitations i
+        WHERE n.type = 'TEAM_INVITE' AND n.data ->> 'token' = i.token
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_notifications_invitation_id'), table_name='notifications')
+    op.drop_constraint('notifications_invitation_id_fkey', 'notifications', type_='foreignkey')
+    op.drop_column('notifications', 'invitation_id')
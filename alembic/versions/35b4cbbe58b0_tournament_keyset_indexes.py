@@ -0,0 +1,33 @@
+"""Tournament keyset indexes
+
+Revision ID: 35b4cbbe58b0
+Revises: 7c2c16161235
+Create Date: 2026-10-18 13:14:17.416833
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '35b4cbbe58b0'
+down_revision: Union[str, Sequence[str], None] = '7c2c16161235'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Paginación por cursor (start_date DESC, id DESC); los índices B-tree se recorren al revés
+    op.create_index('ix_tournaments_start_date_id', 'tournaments', ['start_date', 'id'], unique=False)
+    op.create_index('ix_tournaments_status_start_date_id', 'tournaments', ['status', 'start_date', 'id'], unique=False)
+    op.create_index('ix_tournaments_category_start_date_id', 'tournaments', ['category', 'start_date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tournaments_category_start_date_id', table_name='tournaments')
+    op.drop_index('ix_tournaments_status_start_date_id', table_name='tournaments')
+    op.drop_index('ix_tournaments_start_date_id', table_name='tournaments')
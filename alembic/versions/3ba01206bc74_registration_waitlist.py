@@ -0,0 +1,46 @@
+"""Registration waitlist
+
+Revision ID: 3ba01206bc74
+Revises: d34b013a6233
+Create Date: 2026-10-18 13:22:17.417627
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3ba01206bc74'
+down_revision: Union[str, Sequence[str], None] = 'd34b013a6233'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('registrations', sa.Column(
+        'created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True
+    ))
+    # Si hubiera duplicados previos se conserva una sola inscripción por equipo y torneo
+    op.execute("""
+        DELETE FROM registrations a
+        USING registrations b
+        WHERE a.tournament_id = b.tournament_id AND a.team_id = b.team_id AND a.id > b.id
+    """)
+    op.create_unique_constraint('uq_registrations_tournament_team', 'registrations', ['tournament_id', 'team_id'])
+    # El contador ahora solo cuenta inscripciones que ocupan cupo
+    op.execute("""
+        UPDATE tournaments t
+        SET registered_teams = (
+            SELECT count(*) FROM registrations r
+            WHERE r.tournament_id = t.id AND r.payment_status IN ('pending', 'verified')
+        )
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_registrations_tournament_team', 'registrations', type_='unique')
+    op.drop_column('registrations', 'created_at')
@@ -0,0 +1,31 @@
+"""Notification inbox index
+
+Revision ID: 6b117d7a62e2
+Revises: 731e43b6b7aa
+Create Date: 2026-10-18 13:31:09.168642
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b117d7a62e2'
+down_revision: Union[str, Sequence[str], None] = '731e43b6b7aa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_notifications_user_id_created_at_id', 'notifications',
+        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notifications_user_id_created_at_id', table_name='notifications')
@@ -0,0 +1,110 @@
+"""Notification unread counter
+
+Revision ID: 731e43b6b7aa
+Revises: 7b1bbf771290
+Create Date: 2026-10-18 13:29:56.638147
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '731e43b6b7aa'
+down_revision: Union[str, Sequence[str], None] = '7b1bbf771290'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("UPDATE notifications SET is_read = false WHERE is_read IS NULL")
+    op.alter_column('notifications', 'is_read', nullable=False, server_default=sa.text('false'))
+    op.create_index(
+        'ix_notifications_user_id_unread', 'notifications', ['user_id'],
+        unique=False, postgresql_where=sa.text('NOT is_read')
+    )
+
+    op.create_table('notification_counters',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('unread', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Un solo upsert de deltas por sentencia (ordenado por user_id para no generar deadlocks
+    # entre inserciones masivas concurrentes)
+    op.execute("""
+        CREATE FUNCTION notifications_unread_counter() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO notification_counters (user_id, unread)
+                SELECT user_id, count(*) FROM new_rows WHERE NOT is_read
+                GROUP BY user_id ORDER BY user_id
+                ON CONFLICT (user_id) DO UPDATE
+                SET unread = notification_counters.unread + EXCLUDED.unread;
+            ELSE
+                INSERT INTO notification_counters (user_id, unread)
+                SELECT user_id, sum(delta) FROM (
+                    SELECT user_id, -1 AS delta FROM old_rows WHERE NOT is_read
+                    UNION ALL
+                    SELECT user_id, 1 AS delta FROM new_rows WHERE NOT is_read
+                ) AS changes
+                GROUP BY user_id HAVING sum(delta) <> 0 ORDER BY user_id
+                ON CONFLICT (user_id) DO UPDATE
+                SET unread = greatest(notification_counters.unread + EXCLUDED.unread, 0);
+            END IF;
+            RETURN NULL;
+        END;
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER notifications_unread_insert AFTER INSERT ON notifications
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notifications_unread_counter()
+    """)
+    op.execute("""
+        CREATE TRIGGER notifications_unread_update AFTER UPDATE ON notifications
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notifications_unread_counter()
+    """)
+    # DELETE solo tiene old_rows: función propia
+    op.execute("""
+        CREATE FUNCTION notifications_unread_counter_delete() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO notification_counters (user_id, unread)
+            SELECT user_id, -count(*) FROM old_rows WHERE NOT is_read
+            GROUP BY user_id ORDER BY user_id
+            ON CONFLICT (user_id) DO UPDATE
+            SET unread = greatest(notification_counters.unread + EXCLUDED.unread, 0);
+            RETURN NULL;
+        END;
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER notifications_unread_delete AFTER DELETE ON notifications
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notifications_unread_counter_delete()
+    """)
+
+    # Backfill con el conteo actual (usa el índice parcial)
+    op.execute("""
+        INSERT INTO notification_counters (user_id, unread)
+        SELECT user_id, count(*) FROM notifications WHERE NOT is_read GROUP BY user_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER notifications_unread_delete ON notifications")
+    op.execute("DROP TRIGGER notifications_unread_update ON notifications")
+    op.execute("DROP TRIGGER notifications_unread_insert ON notifications")
+    op.execute("DROP FUNCTION notifications_unread_counter_delete()")
+    op.execute("DROP FUNCTION notifications_unread_counter()")
+    op.drop_table('notification_counters')
+    op.drop_index('ix_notifications_user_id_unread', table_name='notifications')
+    op.alter_column('notifications', 'is_read', nullable=True, server_default=None)
@@ -0,0 +1,30 @@
+"""Invitation status expires index
+
+Revision ID: 7b1bbf771290
+Revises: 182e05bb49f3
+Create Date: 2026-10-18 13:26:24.038880
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b1bbf771290'
+down_revision: Union[str, Sequence[str], None] = '182e05bb49f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_team_invitations_status_expires_at', 'team_invitations', ['status', 'expires_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_team_invitations_status_expires_at', table_name='team_invitations')
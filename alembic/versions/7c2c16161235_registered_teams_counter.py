@@ -0,0 +1,33 @@
+"""Registered teams counter
+
+Revision ID: 7c2c16161235
+Revises: f710281c3023
+Create Date: 2026-10-18 13:13:47.822868
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2c16161235'
+down_revision: Union[str, Sequence[str], None] = 'f710281c3023'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tournaments', sa.Column('registered_teams', sa.Integer(), server_default='0', nullable=False))
+    # Backfill con el conteo actual de inscripciones
+    op.execute("""
+        UPDATE tournaments t
+        SET registered_teams = (SELECT count(*) FROM registrations r WHERE r.tournament_id = t.id)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tournaments', 'registered_teams')
@@ -0,0 +1,30 @@
+"""Team members unique
+
+Revision ID: cc5546a60603
+Revises: 3ba01206bc74
+Create Date: 2026-10-18 13:25:18.433004
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cc5546a60603'
+down_revision: Union[str, Sequence[str], None] = '3ba01206bc74'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # La PK heredada (user_id, team_id) ya evita duplicados; este constraint lo hace explícito
+    # en el modelo y su índice (team_id, user_id) sirve para contar integrantes por equipo
+    op.create_unique_constraint('uq_team_members_team_user', 'team_members', ['team_id', 'user_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_team_members_team_user', 'team_members', type_='unique')
@@ -0,0 +1,30 @@
+"""Bracket position
+
+Revision ID: d34b013a6233
+Revises: 35b4cbbe58b0
+Create Date: 2026-10-18 13:15:46.830191
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd34b013a6233'
+down_revision: Union[str, Sequence[str], None] = '35b4cbbe58b0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('matches', sa.Column('bracket_position', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_matches_tournament_id'), 'matches', ['tournament_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_matches_tournament_id'), table_name='matches')
+    op.drop_column('matches', 'bracket_position')
@@ -0,0 +1,30 @@
+"""Rank cache
+
+Revision ID: f710281c3023
+Revises: 55c6121b03ba
+Create Date: 2026-10-18 13:11:49.162199
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'f710281c3023'
+down_revision: Union[str, Sequence[str], None] = '55c6121b03ba'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('player_accounts', sa.Column('rank_snapshot', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.add_column('player_accounts', sa.Column('rank_updated_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('player_accounts', 'rank_updated_at')
+    op.drop_column('player_accounts', 'rank_snapshot')
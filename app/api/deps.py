@@ -1,13 +1,16 @@
+from typing import Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
-from app.core.security import decode_token
+from app.core.database import get_db, AsyncSessionLocal
+from app.core.security import get_access_token_subject
 from app.models import User, UserRole
 from app.services.user_service import UserService
 
 # 1. Definimos el esquema como HTTPBearer
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
 async def get_current_user(
@@ -18,20 +21,46 @@ async def get_current_user(
     # 3. Extraemos el token real del campo 'credentials'
     token = auth.credentials
 
-    payload = decode_token(token)
-    if not payload or payload.get("type") != "access":
+    # Token y usuario se sirven desde caché en memoria cuando es posible
+    user_id = get_access_token_subject(token)
+    if not user_id:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token inválido o expirado",
         )
 
-    user_id = payload.get("sub")
-    user = await UserService.get_user_by_id(db, user_id)
+    user = await UserService.get_principal(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
 
     return user
 
+async def authenticate_token(token: Optional[str]) -> User:
+    """
+    Autenticación para conexiones largas (SSE / WebSocket).
+    Usa una sesión propia y corta: no retenemos una conexión del pool por socket abierto.
+    """
+    user_id = get_access_token_subject(token) if token else None
+    if not user_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token inválido o expirado",
+        )
+
+    async with AsyncSessionLocal() as db:
+        user = await UserService.get_principal(db, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="Usuario no encontrado")
+    return user
+
+
+async def get_stream_user(
+        token: Optional[str] = None,
+        auth: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+) -> User:
+    # EventSource del navegador no envía cabeceras: aceptamos también ?token=
+    return await authenticate_token(auth.credentials if auth else token)
+
 def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
     """
     Valida que el usuario logueado tenga el rol de ADMIN.
@@ -1,9 +1,12 @@
+from typing import List
+
 from fastapi import APIRouter, Depends, status, Body
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from app.core.database import get_db
 from app.api.deps import get_current_user
 from app.models.user import User
+from app.schemas.invitation import BulkInviteRequest, BulkInviteResult
 from app.services.invitation_service import InvitationService
 
 # Definimos el router
@@ -43,6 +46,20 @@ async def invite_user_by_nick(
     )
 
 
+@router.post("/teams/{team_id}/invite/bulk", response_model=List[BulkInviteResult], status_code=status.HTTP_201_CREATED)
+async def invite_users_bulk(
+    team_id: UUID,
+    data: BulkInviteRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    [CAPITÁN] Invita a varios usuarios por nick en una sola petición.
+    Devuelve el resultado por nick (invited, not_found, already_member, duplicate).
+    """
+    return await InvitationService.invite_users_bulk(db, team_id, current_user.id, data.nicks)
+
+
 @router.post("/{token}/accept", status_code=status.HTTP_200_OK)
 async def accept_team_invitation(
     token: str,
@@ -0,0 +1,38 @@
+from typing import List
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_admin
+from app.core.database import get_db
+from app.models.user import User
+from app.schemas.match import GameResult, GameResultBatch, GameResultOutcome
+from app.services.match_service import MatchService
+
+router = APIRouter(prefix="/matches", tags=["matches"])
+
+@router.post("/results", response_model=List[GameResultOutcome])
+async def record_game_results(
+    data: GameResultBatch,
+    db: AsyncSession = Depends(get_db),
+    current_admin: User = Depends(get_current_admin) # Solo Admins
+):
+    """
+    [ADMIN] Registra varios mapas a la vez (ej: toda una ronda).
+    Cierra las series ganadas y avanza a los ganadores en el bracket.
+    """
+    return await MatchService.record_games(db, data.results)
+
+@router.post("/{match_id}/games", response_model=GameResultOutcome)
+async def record_game_result(
+    match_id: UUID,
+    winner_team_id: UUID,
+    riot_game_id: str | None = None,
+    db: AsyncSession = Depends(get_db),
+    current_admin: User = Depends(get_current_admin) # Solo Admins
+):
+    """[ADMIN] Registra el resultado de un mapa de la serie"""
+    result = GameResult(match_id=match_id, winner_team_id=winner_team_id, riot_game_id=riot_game_id)
+    outcomes = await MatchService.record_games(db, [result])
+    return outcomes[0]
@@ -1,34 +1,148 @@
+import asyncio
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from datetime import datetime
 
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+
+from sqlalchemy import select, update, delete, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_stream_user, authenticate_token
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.notification_hub import notification_hub
+from app.core.pagination import encode_cursor, decode_cursor
 from app.models import User
-from app.schemas.invitation import NotificationResponse
-from app.models.notification import Notification
+from app.schemas.invitation import NotificationResponse, NotificationReadRequest, NotificationDeleteRequest
+from app.models.notification import Notification, NotificationCounter
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
+@router.get("/stream")
+async def stream_notifications(current_user: User = Depends(get_stream_user)):
+    """
+    Push de notificaciones por Server-Sent Events.
+    Envía un comentario ': ping' cada NOTIFICATION_HEARTBEAT_SECONDS y un evento
+    {"type": "RESYNC"} si el cliente se atrasó o se perdieron mensajes (recargar bandeja).
+    """
+    user_id = current_user.id
+
+    async def events():
+        async with notification_hub.subscribe(user_id) as subscription:
+            yield "retry: 5000\n\n"
+            while True:
+                message = await subscription.next(settings.NOTIFICATION_HEARTBEAT_SECONDS)
+                yield f"data: {message}\n\n" if message else ": ping\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.websocket("/ws")
+async def notifications_socket(websocket: WebSocket, token: Optional[str] = None):
+    """Push de notificaciones por WebSocket (?token=<access token>), mismos mensajes que /stream"""
+    try:
+        user = await authenticate_token(token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+
+    async def watch_disconnect():
+        # El cliente no envía nada útil; solo esperamos el cierre
+        try:
+            while (await websocket.receive())["type"] != "websocket.disconnect":
+                pass
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+
+    async def send(subscription):
+        try:
+            while True:
+                message = await subscription.next(settings.NOTIFICATION_HEARTBEAT_SECONDS)
+                await websocket.send_text(message or '{"type": "PING"}')
+        except (WebSocketDisconnect, RuntimeError, OSError):
+            pass
+
+    async with notification_hub.subscribe(user.id) as subscription:
+        tasks = [asyncio.create_task(watch_disconnect()), asyncio.create_task(send(subscription))]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+
 @router.get("/", response_model=List[NotificationResponse])
 async def get_my_notifications(
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    type: Optional[str] = None,
+    is_read: Optional[bool] = None,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Trae las últimas 20 notificaciones"""
+    """
+    Bandeja de notificaciones, de la más nueva a la más vieja.
+    Paginación por cursor sobre (created_at, id): la cabecera X-Next-Cursor trae el cursor
+    de la siguiente página (pasarlo como ?cursor=...). Filtros opcionales: type, is_read.
+    """
     query = (
         select(Notification)
         .where(Notification.user_id == current_user.id)
-        .order_by(Notification.created_at.desc())
-        .limit(20)
+        .order_by(Notification.created_at.desc(), Notification.id.desc())  # id desempata fechas iguales
+        .limit(limit)
     )
+    if type is not None:
+        query = query.where(Notification.type == type)
+    if is_read is not None:
+        query = query.where(Notification.is_read.is_(is_read))
+    if cursor:
+        last_date, last_id = decode_cursor(cursor, datetime.fromisoformat, UUID)
+        query = query.where(tuple_(Notification.created_at, Notification.id) < (last_date, last_id))
+
     result = await db.execute(query)
-    return result.scalars().all()
+    notifications = result.scalars().all()
+
+    if len(notifications) == limit:
+        last = notifications[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.created_at.isoformat(), last.id)
+    return notifications
+
+@router.get("/unread-count")
+async def get_unread_count(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Cantidad de no leídas para el badge (lectura por PK del contador, sin cargar notificaciones)"""
+    query = select(NotificationCounter.unread).where(NotificationCounter.user_id == current_user.id)
+    unread = (await db.execute(query)).scalar()
+    return {"unread": unread or 0}
+
+@router.patch("/read")
+async def mark_many_as_read(
+    data: NotificationReadRequest = NotificationReadRequest(),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Marca como leídas todas (sin ids) o las indicadas, en un solo UPDATE"""
+    query = (
+        update(Notification)
+        .where(Notification.user_id == current_user.id, Notification.is_read.is_(False))
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    )
+    if data.ids is not None:
+        query = query.where(Notification.id.in_(data.ids))
+    result = await db.execute(query)
+    await db.commit()
+    return {"updated": result.rowcount}
 
 @router.patch("/{notification_id}/read")
 async def mark_as_read(
@@ -37,12 +151,40 @@ async def mark_as_read(
     current_user: User = Depends(get_current_user)
 ):
     """Marca una notificación como leída (para apagar la luz roja)"""
-    notif = await db.get(Notification, notification_id)
-    if notif and notif.user_id == current_user.id:
-        notif.is_read = True
-        await db.commit()
+    query = (
+        update(Notification)
+        .where(
+            Notification.id == notification_id,
+            Notification.user_id == current_user.id,
+            Notification.is_read.is_(False)
+        )
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(query)
+    await db.commit()
     return {"ok": True}
 
+@router.delete("/", status_code=status.HTTP_200_OK)
+async def delete_notifications(
+    data: NotificationDeleteRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Limpia la bandeja en un solo DELETE: por lista de ids y/o las anteriores a 'older_than'"""
+    query = (
+        delete(Notification)
+        .where(Notification.user_id == current_user.id)
+        .execution_options(synchronize_session=False)
+    )
+    if data.ids is not None:
+        query = query.where(Notification.id.in_(data.ids))
+    if data.older_than is not None:
+        query = query.where(Notification.created_at < data.older_than)
+    result = await db.execute(query)
+    await db.commit()
+    return {"deleted": result.rowcount}
+
 @router.delete("/{notification_id}", status_code=status.HTTP_200_OK)
 async def delete_notification(
     notification_id: UUID,
@@ -53,22 +195,20 @@ async def delete_notification(
     Elimina una notificación específica.
     Útil para limpiar la bandeja o cuando se rechaza una invitación manualmente.
     """
-    # 1. Buscamos la notificación asegurando que pertenezca al usuario actual
-    query = select(Notification).where(
-        Notification.id == notification_id,
-        Notification.user_id == current_user.id
+    # Un solo DELETE que además asegura que pertenezca al usuario actual
+    query = (
+        delete(Notification)
+        .where(
+            Notification.id == notification_id,
+            Notification.user_id == current_user.id
+        )
+        .returning(Notification.id)
     )
-    result = await db.execute(query)
-    notification = result.scalars().first()
-
-    if not notification:
+    if (await db.execute(query)).first() is None:
         raise HTTPException(
             status_code=404,
             detail="Notificación no encontrada o no te pertenece"
         )
-
-    # 2. Eliminamos
-    await db.delete(notification)
     await db.commit()
 
-    return {"message": "Notificación eliminada correctamente"}
\ No newline at end of file
+    return {"message": "Notificación eliminada correctamente"}
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_current_admin
 from app.models.user import User, PlayerAccount
 from app.services.riot_service import RiotService
+from app.services.rank_service import RankService
 from sqlalchemy import select
 
 router = APIRouter(prefix="/players", tags=["players"])
@@ -65,12 +66,18 @@ async def get_riot_profile(
     if not player_acc:
         raise HTTPException(status_code=404, detail="No tienes una cuenta vinculada")
 
-    # 2. Llamada directa por PUUID usando el nuevo método
-    ranks = await RiotService.get_rank_data_by_puuid(player_acc.region, player_acc.puuid)
+    # 2. Rangos desde la caché (memoria / snapshot en DB); Riot solo se consulta una vez por TTL
+    ranks = await RankService.get_ranks(db, player_acc)
 
     return {
         "riot_id": player_acc.riot_id,
         "riot_tag": player_acc.riot_tag,
         "region": player_acc.region,
         "ranks": ranks
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/riot-rate-limits")
+async def get_riot_rate_limits(current_admin: User = Depends(get_current_admin)):
+    """[ADMIN] Cola, esperas y 429 por plataforma/método para ver qué tan cerca estamos del límite"""
+    return RiotService.rate_governor.metrics()
@@ -1,18 +1,32 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, status
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
 from app.core.database import get_db
-from app.api.deps import get_current_admin
+from app.core.response_cache import response_cache
+from app.api.deps import get_current_admin, get_current_user
 from app.schemas.tournament import TournamentCreate, TournamentUpdate, TournamentResponse, TournamentListResponse, \
-    TournamentDetailResponse
+    TournamentDetailResponse, RegistrationCreate, RegistrationResponse, \
+    PaymentReviewBatch, PaymentReviewResult
+from app.schemas.match import BracketGenerate, BracketResponse, SwissRoundGenerate, SwissStanding, ScheduleRound, \
+    ScheduleResult
 from app.services.tournament_service import TournamentService
+from app.services.bracket_service import BracketService
+from app.services.swiss_service import SwissService
+from app.services.scheduling_service import SchedulingService
+from app.services.registration_service import RegistrationService
 from app.models.user import User
+from app.models.tournament import TournamentStatus
 
 router = APIRouter(prefix="/tournaments", tags=["tournaments"])
 
+# Serializadores para guardar las respuestas públicas ya convertidas a bytes
+_list_adapter = TypeAdapter(List[TournamentListResponse])
+_standings_adapter = TypeAdapter(List[SwissStanding])
+
 @router.post("/", response_model=TournamentResponse, status_code=status.HTTP_201_CREATED)
 async def create_tournament(
     data: TournamentCreate,
@@ -32,24 +46,134 @@ async def update_tournament(
     """Actualiza datos del torneo (Estado, Premios, etc.)"""
     return await TournamentService.update_tournament(db, tournament_id, data)
 
+@router.post("/{tournament_id}/registrations", response_model=RegistrationResponse, status_code=status.HTTP_201_CREATED)
+async def register_team(
+    tournament_id: UUID,
+    data: RegistrationCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """[CAPITÁN] Inscribe al equipo; si el torneo está lleno queda en lista de espera (waitlisted)"""
+    return await RegistrationService.register_team(db, tournament_id, data.team_id, current_user.id)
+
+@router.post("/registrations/review", response_model=PaymentReviewResult)
+async def review_payments(
+    data: PaymentReviewBatch,
+    db: AsyncSession = Depends(get_db),
+    current_admin: User = Depends(get_current_admin) # Solo Admins
+):
+    """Verifica o rechaza en lote los pagos de varias inscripciones y notifica a los capitanes"""
+    return await RegistrationService.review_payments(db, data, current_admin.id)
+
+@router.post("/registrations/{registration_id}/reject")
+async def reject_registration(
+    registration_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_admin: User = Depends(get_current_admin) # Solo Admins
+):
+    """Rechaza una inscripción y promueve al primer equipo de la lista de espera"""
+    return await RegistrationService.reject_registration(db, registration_id)
+
+@router.post("/{tournament_id}/bracket", status_code=status.HTTP_201_CREATED)
+async def generate_bracket(
+    tournament_id: UUID,
+    data: BracketGenerate = BracketGenerate(),
+    db: AsyncSession = Depends(get_db),
+    current_admin: User = Depends(get_current_admin) # Solo Admins
+):
+    """Genera el bracket de eliminación simple con los equipos verificados"""
+    return await BracketService.generate_bracket(db, tournament_id, data)
+
+@router.post("/{tournament_id}/swiss/rounds", status_code=status.HTTP_201_CREATED)
+async def generate_swiss_round(
+    tournament_id: UUID,
+    data: SwissRoundGenerate = SwissRoundGenerate(),
+    db: AsyncSession = Depends(get_db),
+    current_admin: User = Depends(get_current_admin) # Solo Admins
+):
+    """Empareja la siguiente ronda del sistema suizo (sin revanchas, bye al último sin bye)"""
+    return await SwissService.generate_round(db, tournament_id, data)
+
+@router.post("/{tournament_id}/schedule", response_model=ScheduleResult)
+async def schedule_pending_matches(
+    tournament_id: UUID,
+    data: ScheduleRound = ScheduleRound(),
+    db: AsyncSession = Depends(get_db),
+    current_admin: User = Depends(get_current_admin) # Solo Admins
+):
+    """Agenda todas las series pendientes con las propuestas de los capitanes o los horarios por defecto"""
+    return await SchedulingService.schedule_round(db, tournament_id, data)
+
 @router.get("/", response_model=List[TournamentListResponse])
 async def list_tournaments(
-    skip: int = 0,
-    limit: int = 20,
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    status: Optional[TournamentStatus] = None,
+    category: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Lista todos los torneos disponibles (Público).
     Muestra: Nombre, Modo, Premio, Equipos Inscritos, Fecha y Estado.
+    Paginación: la cabecera X-Next-Cursor trae el cursor de la siguiente página
+    (pasarlo como ?cursor=...). 'skip' se mantiene por compatibilidad.
+    Se sirve desde la caché de respuestas (ETag / 304) mientras no haya cambios.
     """
-    return await TournamentService.get_all_tournaments(db, skip, limit)
+    async def render():
+        tournaments, next_cursor = await TournamentService.get_all_tournaments(
+            db, skip, limit, cursor=cursor, status=status, category=category
+        )
+        body = _list_adapter.dump_json(
+            [TournamentListResponse.model_validate(t) for t in tournaments]
+        )
+        return body, {"X-Next-Cursor": next_cursor} if next_cursor else {}
+
+    return await response_cache.serve(request, TournamentService.LIST_CACHE_NAMESPACE, render)
 
 @router.get("/{tournament_id}", response_model=TournamentDetailResponse)
 async def get_tournament_details(
+    request: Request,
     tournament_id: UUID,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Obtiene toda la información detallada de un torneo (Público).
     """
-    return await TournamentService.get_tournament_by_id(db, tournament_id)
\ No newline at end of file
+    async def render():
+        tournament = await TournamentService.get_tournament_by_id(db, tournament_id)
+        return TournamentDetailResponse.model_validate(tournament).model_dump_json().encode(), {}
+
+    return await response_cache.serve(request, TournamentService.cache_namespace(tournament_id), render)
+
+@router.get("/{tournament_id}/bracket", response_model=BracketResponse)
+async def get_tournament_bracket(
+    request: Request,
+    tournament_id: UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Bracket completo del torneo para espectadores (Público).
+    Una sola consulta; se sirve desde caché hasta que cambie un partido o mapa.
+    """
+    async def render():
+        bracket = await BracketService.get_bracket(db, tournament_id)
+        return bracket.model_dump_json().encode(), {}
+
+    return await response_cache.serve(request, TournamentService.bracket_cache_namespace(tournament_id), render)
+
+
+@router.get("/{tournament_id}/swiss/standings", response_model=List[SwissStanding])
+async def get_swiss_standings(
+    request: Request,
+    tournament_id: UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """Tabla del sistema suizo: victorias, derrotas y Buchholz (Público)"""
+    async def render():
+        standings = await SwissService.get_standings(db, tournament_id)
+        return _standings_adapter.dump_json(standings), {}
+
+    # Comparte namespace con el bracket: cambia exactamente cuando cambian partidos o mapas
+    return await response_cache.serve(request, TournamentService.bracket_cache_namespace(tournament_id), render)
@@ -8,6 +8,40 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     RIOT_API_KEY: str
 
+    # --- Cliente HTTP de Riot (pool compartido por host) ---
+    RIOT_HTTP2: bool = True
+    RIOT_MAX_CONNECTIONS: int = 20
+    RIOT_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    RIOT_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    RIOT_CONNECT_TIMEOUT_SECONDS: float = 3.0
+    RIOT_READ_TIMEOUT_SECONDS: float = 5.0
+
+    # --- Límites de Riot (se ajustan solos con las cabeceras de respuesta) ---
+    RIOT_DEFAULT_APP_RATE_LIMIT: str = "20:1,100:120"
+    RIOT_MAX_RETRIES: int = 2
+
+    # --- Caché de rangos (stale-while-revalidate) ---
+    RANK_CACHE_TTL_SECONDS: int = 900
+    RANK_CACHE_MAX_STALE_SECONDS: int = 86400
+    RANK_CACHE_MAX_SIZE: int = 50000
+
+    # --- Worker de refresco de rangos ---
+    RANK_REFRESH_BATCH_SIZE: int = 200
+    RANK_REFRESH_CONCURRENCY_PER_REGION: int = 5
+    RANK_REFRESH_INTERVAL_SECONDS: int = 600
+
+    # --- Barrido de invitaciones vencidas ---
+    INVITATION_SWEEP_BATCH_SIZE: int = 500
+    INVITATION_SWEEP_INTERVAL_SECONDS: int = 300
+
+    # --- Push de notificaciones (SSE / WebSocket + LISTEN/NOTIFY) ---
+    NOTIFICATION_CHANNEL: str = "vortex_notifications"
+    NOTIFICATION_PUSH_QUEUE_SIZE: int = 64
+    NOTIFICATION_HEARTBEAT_SECONDS: int = 25
+    # Invalidaciones de las cachés en proceso entre workers (mismo LISTEN); los TTL de
+    # cada caché solo acotan lo viejo que queda una entrada si un aviso se pierde
+    CACHE_INVALIDATION_CHANNEL: str = "vortex_cache_invalidation"
+
     # --- Google OAuth ---
     GOOGLE_CLIENT_ID: str
     GOOGLE_CLIENT_SECRET: str
@@ -16,6 +50,14 @@ class Settings(BaseSettings):
     # --- Base de Datos ---
     DATABASE_URL: str
 
+    # --- Caché de sesión (get_current_user) ---
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+
+    # --- Caché de respuestas públicas (ETag / 304) ---
+    RESPONSE_CACHE_TTL_SECONDS: int = 30
+    RESPONSE_CACHE_MAX_SIZE: int = 1000
+
     # --- Configuración de Pydantic ---
     model_config = SettingsConfigDict(
         env_file=".env",
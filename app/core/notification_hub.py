@@ -0,0 +1,237 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import Callable, Optional
+from uuid import UUID
+
+import asyncpg
+from sqlalchemy import select, func, bindparam, String
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.core.config import settings
+
+# Mensaje de control: el cliente perdió eventos y debe recargar su bandeja
+RESYNC = json.dumps({"type": "RESYNC"})
+
+# Límite de payload de NOTIFY en Postgres (8000 bytes) con margen
+MAX_PAYLOAD_BYTES = 7900
+
+# Llaves por mensaje de invalidación (namespaces/ids de ~50 bytes: cabe en un NOTIFY)
+INVALIDATION_KEYS_PER_MESSAGE = 100
+# Invalidaciones pendientes de difundir mientras el LISTEN está caído
+INVALIDATION_OUTBOX_SIZE = 10000
+
+
+class Subscription:
+    """Cola acotada de una conexión (SSE o WebSocket)"""
+    __slots__ = ("queue",)
+
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize)
+
+    def push(self, message: str):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Backpressure: cliente lento. Descartamos lo pendiente y le pedimos que recargue,
+            # así la memoria por conexión nunca pasa de maxsize mensajes.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def next(self, timeout: float) -> Optional[str]:
+        """Siguiente mensaje, o None si pasó 'timeout' (momento de enviar un heartbeat)"""
+        # asyncio.timeout no crea una tarea extra por espera (a diferencia de wait_for)
+        try:
+            async with asyncio.timeout(timeout):
+                return await self.queue.get()
+        except TimeoutError:
+            return None
+
+
+class NotificationHub:
+    """
+    Pub/sub en proceso de notificaciones por usuario.
+    Las escrituras se publican con pg_notify dentro de la misma transacción (se entregan
+    al hacer commit) y cada worker escucha el canal con LISTEN en una conexión asyncpg
+    dedicada, así una notificación creada en cualquier worker llega a los sockets de todos.
+    La misma conexión difunde las invalidaciones de las cachés en proceso por un segundo
+    canal: cada worker invalida localmente y avisa a los demás (ver invalidate).
+    """
+
+    def __init__(self, channel: str, invalidation_channel: str):
+        self.channel = channel
+        self.invalidation_channel = invalidation_channel
+        self._subscribers: dict[str, set[Subscription]] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._invalidators: dict[str, Callable[[Optional[list[str]]], None]] = {}
+        self._outbox: asyncio.Queue[str] = asyncio.Queue(INVALIDATION_OUTBOX_SIZE)
+
+    @property
+    def connections(self) -> int:
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: UUID):
+        key = str(user_id)
+        subscription = Subscription(settings.NOTIFICATION_PUSH_QUEUE_SIZE)
+        self._subscribers.setdefault(key, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            subs = self._subscribers.get(key)
+            if subs is not None:
+                subs.discard(subscription)
+                if not subs:
+                    del self._subscribers[key]
+
+    def dispatch(self, user_id: str, message: str):
+        """Entrega local: el mismo string serializado se comparte entre todas las conexiones"""
+        for subscription in self._subscribers.get(user_id, ()):
+            subscription.push(message)
+
+    def _resync_all(self):
+        for subs in self._subscribers.values():
+            for subscription in subs:
+                subscription.push(RESYNC)
+
+    def on_invalidate(self, cache: str, handler: Callable[[Optional[list[str]]], None]):
+        """Registra una caché: handler(keys) invalida esas llaves y handler(None) la vacía"""
+        self._invalidators[cache] = handler
+
+    def invalidate(self, cache: str, keys: list[str]):
+        """
+        Invalida las llaves en este worker y encola el aviso para los demás.
+        Llamar después del commit; el aviso sale por la conexión LISTEN en milisegundos.
+        Si el LISTEN está caído los avisos esperan en la cola (acotada); si se pierden,
+        el TTL de cada caché acota cuánto tiempo sirven datos viejos los otros workers.
+        """
+        self._invalidators[cache](keys)
+        if self._listener is None:
+            return
+        for start in range(0, len(keys), INVALIDATION_KEYS_PER_MESSAGE):
+            message = json.dumps({"cache": cache, "keys": keys[start:start + INVALIDATION_KEYS_PER_MESSAGE]})
+            try:
+                self._outbox.put_nowait(message)
+            except asyncio.QueueFull:
+                print(f"Warning: Cola de invalidaciones llena, se descarta el aviso de {cache}")
+                return
+
+    def _clear_caches(self):
+        for handler in self._invalidators.values():
+            handler(None)
+
+    def _on_invalidation(self, connection, pid, channel, payload: str):
+        # Nuestros propios avisos ya se aplicaron localmente
+        if pid == connection.get_server_pid():
+            return
+        try:
+            message = json.loads(payload)
+            handler = self._invalidators[message["cache"]]
+            keys = list(message["keys"])
+        except (ValueError, KeyError, TypeError):
+            print(f"Warning: Payload de invalidación inválido: {payload[:200]}")
+            return
+        handler(keys)
+
+    async def _send_invalidations(self, connection):
+        """Difunde los avisos pendientes; si no llega ninguno en el intervalo, hace de heartbeat"""
+        try:
+            async with asyncio.timeout(settings.NOTIFICATION_HEARTBEAT_SECONDS):
+                payloads = [await self._outbox.get()]
+        except TimeoutError:
+            await connection.fetchval("SELECT 1")
+            return
+        while not self._outbox.empty():
+            payloads.append(self._outbox.get_nowait())
+        await connection.execute(
+            "SELECT pg_notify($1, payload) FROM unnest($2::text[]) AS payload",
+            self.invalidation_channel, payloads
+        )
+
+    def _on_notify(self, connection, pid, channel, payload: str):
+        try:
+            user_id = json.loads(payload)["user_id"]
+        except (ValueError, KeyError, TypeError):
+            print(f"Warning: Payload de notificación inválido: {payload[:200]}")
+            return
+        self.dispatch(user_id, payload)
+
+    async def _listen(self, dsn: str):
+        """Mantiene la conexión LISTEN viva; si se cae reconecta con backoff y pide resync"""
+        backoff = 1
+        while True:
+            try:
+                connection = await asyncpg.connect(dsn)
+            except (OSError, asyncpg.PostgresError) as e:
+                print(f"Warning: No se pudo conectar el LISTEN de notificaciones: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+                continue
+
+            backoff = 1
+            try:
+                await connection.add_listener(self.channel, self._on_notify)
+                await connection.add_listener(self.invalidation_channel, self._on_invalidation)
+                # Mientras no escuchábamos pudimos perder mensajes e invalidaciones
+                self._resync_all()
+                self._clear_caches()
+                while True:
+                    await self._send_invalidations(connection)
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                print(f"Warning: Se perdió la conexión LISTEN de notificaciones: {e}")
+            finally:
+                if not connection.is_closed():
+                    connection.terminate()
+
+    async def start(self, dsn: str):
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen(dsn))
+
+    async def stop(self):
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.cancel()
+            try:
+                await listener
+            except asyncio.CancelledError:
+                pass
+
+    @staticmethod
+    def _payload(notification) -> str:
+        """Serializa una notificación (dict de INSERT o instancia ORM ya con flush)"""
+        get = notification.get if isinstance(notification, dict) else lambda key: getattr(notification, key, None)
+        message = {
+            "user_id": str(get("user_id")),
+            "id": str(get("id")),
+            "type": get("type"),
+            "title": get("title"),
+            "message": get("message"),
+            "data": get("data"),
+            "is_read": bool(get("is_read")),
+            "created_at": get("created_at").isoformat() if get("created_at") else None,
+        }
+        payload = json.dumps(message, default=str)
+        if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+            # El cliente pide el detalle por la API
+            message["data"] = None
+            message["truncated"] = True
+            payload = json.dumps(message, default=str)
+        return payload
+
+    async def publish(self, db, notifications: list):
+        """
+        Emite un NOTIFY por notificación en un solo SELECT pg_notify(...) FROM unnest(:payloads).
+        Los payloads viajan como un único parámetro text[], así la sentencia se compila una
+        vez y queda en caché (un VALUES con miles de filas se recompilaba en cada llamada).
+        Llamar dentro de la transacción que las inserta: Postgres solo las entrega si hay commit.
+        """
+        if not notifications:
+            return
+        outbox = func.unnest(
+            bindparam("payloads", [self._payload(n) for n in notifications], type_=ARRAY(String))
+        ).table_valued("payload").render_derived()
+        await db.execute(select(func.pg_notify(self.channel, outbox.c.payload)).select_from(outbox))
+
+
+notification_hub = NotificationHub(settings.NOTIFICATION_CHANNEL, settings.CACHE_INVALIDATION_CHANNEL)
@@ -0,0 +1,25 @@
+import base64
+import json
+from typing import Any, Callable
+
+from fastapi import HTTPException
+
+
+def encode_cursor(*values: Any) -> str:
+    """Empaqueta los valores de la última fila en un token opaco (base64 url-safe)"""
+    raw = json.dumps([str(v) for v in values], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *parsers: Callable[[str], Any]) -> tuple:
+    """
+    Decodifica un cursor creado con encode_cursor aplicando un parser por valor
+    (ej: datetime.fromisoformat, UUID). Cualquier cursor manipulado da 400.
+    """
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(raw, list) or len(raw) != len(parsers):
+            raise ValueError("Número de valores inválido")
+        return tuple(parse(value) for parse, value in zip(parsers, raw))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor de paginación inválido")
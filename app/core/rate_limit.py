@@ -0,0 +1,195 @@
+import asyncio
+import time
+from typing import Mapping, Optional
+
+
+def parse_rate_limits(header: Optional[str]) -> list[tuple[int, int]]:
+    """
+    Convierte el formato de Riot "20:1,100:120" en [(20, 1), (100, 120)].
+    Cada par es (peticiones, ventana en segundos).
+    """
+    limits = []
+    for part in (header or "").split(","):
+        if ":" not in part:
+            continue
+        count, window = part.split(":", 1)
+        try:
+            limits.append((int(count), int(window)))
+        except ValueError:
+            continue
+    return limits
+
+
+class TokenBucket:
+    """Bucket clásico: capacidad = límite, se rellena a límite/ventana tokens por segundo"""
+
+    def __init__(self, limit: int, window: int):
+        self.limit = limit
+        self.window = window
+        self.tokens = float(limit)
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float):
+        rate = self.limit / self.window
+        self.tokens = min(self.limit, self.tokens + (now - self.updated_at) * rate)
+        self.updated_at = now
+
+    def wait_time(self, now: float) -> float:
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) * self.window / self.limit
+
+    def consume(self):
+        self.tokens -= 1
+
+
+class RateLimitScope:
+    """
+    Conjunto de buckets que aplican a una misma llave (p. ej. límite de app en 'la1'
+    o límite del método league-v4 en 'la1'). El lock de asyncio es FIFO, así que
+    los llamadores se atienden en orden de llegada en lugar de fallar.
+    """
+
+    def __init__(self, limits: list[tuple[int, int]]):
+        self.buckets = [TokenBucket(limit, window) for limit, window in limits]
+        self.blocked_until = 0.0
+        self.lock = asyncio.Lock()
+
+        # Métricas
+        self.queued = 0
+        self.requests = 0
+        self.throttled = 0
+        self.rate_limited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def configure(self, limits: list[tuple[int, int]]):
+        """Aplica los límites anunciados por Riot conservando el consumo actual"""
+        current = {(b.limit, b.window): b for b in self.buckets}
+        if not limits or set(current) == set(limits):
+            return
+        self.buckets = [current.get(spec) or TokenBucket(*spec) for spec in limits]
+
+    def sync_counts(self, counts: list[tuple[int, int]]):
+        """Ajusta los tokens con el conteo real que reporta Riot (X-*-Rate-Limit-Count)"""
+        used_by_window = {window: used for used, window in counts}
+        now = time.monotonic()
+        for bucket in self.buckets:
+            used = used_by_window.get(bucket.window)
+            if used is not None:
+                bucket._refill(now)
+                bucket.tokens = min(bucket.tokens, bucket.limit - used)
+
+    def block(self, seconds: float):
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def wait_time(self) -> float:
+        now = time.monotonic()
+        wait = max(0.0, self.blocked_until - now)
+        for bucket in self.buckets:
+            wait = max(wait, bucket.wait_time(now))
+        return wait
+
+    def consume(self):
+        for bucket in self.buckets:
+            bucket.consume()
+
+    async def wait_for_token(self):
+        while (delay := self.wait_time()) > 0:
+            await asyncio.sleep(delay)
+
+    def metrics(self) -> dict:
+        return {
+            "limits": [f"{b.limit}:{b.window}" for b in self.buckets],
+            "queue_depth": self.queued,
+            "requests": self.requests,
+            "throttled_requests": self.throttled,
+            "rate_limited_responses": self.rate_limited,
+            "total_wait_seconds": round(self.total_wait, 3),
+            "max_wait_seconds": round(self.max_wait, 3),
+            "avg_wait_seconds": round(self.total_wait / self.requests, 4) if self.requests else 0.0,
+        }
+
+
+class RateGovernor:
+    """
+    Gobernador de límites de la API de Riot.
+    Mantiene un scope de aplicación por plataforma y uno por (plataforma, método),
+    aprende los límites reales de las cabeceras X-App-Rate-Limit / X-Method-Rate-Limit
+    y respeta Retry-After cuando Riot responde 429.
+    """
+
+    def __init__(self, default_app_limits: str = ""):
+        self.default_app_limits = parse_rate_limits(default_app_limits)
+        self._app: dict[str, RateLimitScope] = {}
+        self._methods: dict[tuple[str, str], RateLimitScope] = {}
+
+    def _app_scope(self, platform: str) -> RateLimitScope:
+        if platform not in self._app:
+            self._app[platform] = RateLimitScope(self.default_app_limits)
+        return self._app[platform]
+
+    def _method_scope(self, platform: str, method: str) -> RateLimitScope:
+        key = (platform, method)
+        if key not in self._methods:
+            # Sin límites hasta que Riot nos los anuncie en la primera respuesta
+            self._methods[key] = RateLimitScope([])
+        return self._methods[key]
+
+    async def acquire(self, platform: str, method: str):
+        """Espera (en cola FIFO) hasta que haya cupo en el método y en la app"""
+        method_scope = self._method_scope(platform, method)
+        app_scope = self._app_scope(platform)
+        started = time.monotonic()
+
+        # Orden fijo de locks (método -> app) para evitar deadlocks
+        method_scope.queued += 1
+        app_scope.queued += 1
+        try:
+            async with method_scope.lock:
+                await method_scope.wait_for_token()
+                async with app_scope.lock:
+                    await app_scope.wait_for_token()
+                    method_scope.consume()
+                    app_scope.consume()
+        finally:
+            method_scope.queued -= 1
+            app_scope.queued -= 1
+
+        waited = time.monotonic() - started
+        for scope in (method_scope, app_scope):
+            scope.requests += 1
+            scope.total_wait += waited
+            scope.max_wait = max(scope.max_wait, waited)
+            if waited > 0.001:
+                scope.throttled += 1
+
+    def update(self, platform: str, method: str, status_code: int, headers: Mapping[str, str]):
+        """Actualiza los buckets con las cabeceras de la respuesta de Riot"""
+        app_scope = self._app_scope(platform)
+        method_scope = self._method_scope(platform, method)
+
+        app_scope.configure(parse_rate_limits(headers.get("X-App-Rate-Limit")))
+        app_scope.sync_counts(parse_rate_limits(headers.get("X-App-Rate-Limit-Count")))
+        method_scope.configure(parse_rate_limits(headers.get("X-Method-Rate-Limit")))
+        method_scope.sync_counts(parse_rate_limits(headers.get("X-Method-Rate-Limit-Count")))
+
+        if status_code == 429:
+            try:
+                retry_after = float(headers.get("Retry-After", 1))
+            except ValueError:
+                retry_after = 1.0
+
+            scope = app_scope if headers.get("X-Rate-Limit-Type") == "application" else method_scope
+            scope.rate_limited += 1
+            scope.block(retry_after)
+
+    def metrics(self) -> dict:
+        return {
+            "app": {platform: scope.metrics() for platform, scope in self._app.items()},
+            "methods": {
+                f"{platform}:{method}": scope.metrics()
+                for (platform, method), scope in self._methods.items()
+            },
+        }
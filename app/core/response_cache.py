@@ -0,0 +1,76 @@
+import hashlib
+from collections import defaultdict
+from typing import Awaitable, Callable, Optional
+
+from fastapi import Request, Response
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.notification_hub import notification_hub
+
+
+class CachedResponse:
+    __slots__ = ("body", "etag", "headers")
+
+    def __init__(self, body: bytes, headers: dict):
+        self.body = body
+        # ETag fuerte derivado del contenido: es el mismo en todos los workers
+        self.etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        self.headers = headers
+
+
+class ResponseCache:
+    """
+    Caché de respuestas públicas ya serializadas (bytes), con ETag y 304.
+    Cada entrada se guarda bajo la versión actual de su namespace; al escribir
+    se hace bump() y las entradas viejas dejan de ser alcanzables (y salen por LRU/TTL).
+    bump() se difunde a los demás workers por notification_hub.
+    """
+    INVALIDATION_NAME = "responses"
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._versions: dict[str, int] = defaultdict(int)
+        notification_hub.on_invalidate(self.INVALIDATION_NAME, self._invalidate)
+
+    def _invalidate(self, namespaces: Optional[list[str]]):
+        if namespaces is None:
+            self._entries.clear()
+            return
+        for namespace in namespaces:
+            self._versions[namespace] += 1
+
+    def bump(self, *namespaces: str):
+        notification_hub.invalidate(self.INVALIDATION_NAME, list(namespaces))
+
+    @staticmethod
+    def _matches(if_none_match: Optional[str], etag: str) -> bool:
+        if not if_none_match:
+            return False
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates
+
+    async def serve(
+            self,
+            request: Request,
+            namespace: str,
+            render: Callable[[], Awaitable[tuple[bytes, dict]]]
+    ) -> Response:
+        """Devuelve la respuesta cacheada (o 304) y solo llama a render() en un miss"""
+        key = (namespace, self._versions[namespace], request.url.path, request.url.query)
+        entry = self._entries.get(key)
+        if entry is None:
+            body, headers = await render()
+            entry = CachedResponse(body, headers)
+            self._entries.set(key, entry)
+
+        headers = {**entry.headers, "ETag": entry.etag, "Cache-Control": "no-cache"}
+        if self._matches(request.headers.get("if-none-match"), entry.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+response_cache = ResponseCache(
+    maxsize=settings.RESPONSE_CACHE_MAX_SIZE,
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS
+)
@@ -1,8 +1,15 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Any
 from jose import JWTError, jwt
+from app.core.cache import TTLCache
 from app.core.config import settings
 
+# Tokens de acceso ya verificados -> user_id (evita re-decodificar el JWT en cada request)
+_access_token_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
 def create_access_token(subject: str | Any, expires_delta: Optional[timedelta] = None) -> str:
     """
     Crea un token de acceso de corta duración.
@@ -43,4 +50,25 @@ def decode_token(token: str) -> Optional[dict]:
         )
         return payload
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+
+
+def get_access_token_subject(token: str) -> Optional[str]:
+    """
+    Devuelve el 'sub' de un token de acceso válido, o None si es inválido o expiró.
+    El resultado se cachea como máximo hasta la expiración del propio token.
+    """
+    subject = _access_token_cache.get(token)
+    if subject is not None:
+        return subject
+
+    payload = decode_token(token)
+    if not payload or payload.get("type") != "access" or not payload.get("sub"):
+        return None
+
+    subject = payload["sub"]
+    ttl = settings.PRINCIPAL_CACHE_TTL_SECONDS
+    if payload.get("exp"):
+        ttl = min(ttl, payload["exp"] - datetime.now(timezone.utc).timestamp())
+    _access_token_cache.set(token, subject, ttl=ttl)
+    return subject
@@ -0,0 +1,52 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class _Call:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalescencia de llamadas concurrentes: mientras haya una llamada en vuelo para una
+    llave, los demás llamadores esperan el mismo futuro en lugar de repetir el trabajo.
+    - Los errores se propagan a todos los que esperan.
+    - Cancelar a un llamador no cancela la llamada compartida, salvo que sea el último.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, _Call] = {}
+
+    def _forget(self, key: Hashable, call: _Call, task: asyncio.Task):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Marcamos la excepción como leída aunque todos los llamadores se hayan ido
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda task: self._forget(key, call, task))
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            # Si nadie más espera el resultado, no tiene sentido seguir con la llamada.
+            # La llave se libera antes de cancelar: quien llegue mientras la tarea muere
+            # debe abrir una llamada nueva, no heredar una cancelación ajena.
+            if call.waiters == 1 and not call.task.done():
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def in_flight(self) -> int:
+        return len(self._calls)
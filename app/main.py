@@ -1,9 +1,26 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
-from app.api.v1 import auth, user, players, teams, invitations, notifications, tournament
+from app.api.v1 import auth, user, players, teams, invitations, notifications, tournament, matches
+from app.core.database import engine
+from app.core.notification_hub import notification_hub
+from app.services.riot_service import RiotService
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Clientes HTTP compartidos para Riot (pool de conexiones por host)
+    await RiotService.startup()
+    # LISTEN de notificaciones: conexión asyncpg directa (sin el driver de SQLAlchemy)
+    await notification_hub.start(engine.url.set(drivername="postgresql").render_as_string(hide_password=False))
+    yield
+    await notification_hub.stop()
+    await RiotService.shutdown()
+
 
-app = FastAPI(title="Vortex Esports API")
+app = FastAPI(title="Vortex Esports API", lifespan=lifespan)
 
 # Configuración de CORS
 origins = [
@@ -27,4 +44,5 @@ app.include_router(players.router, prefix="/api/v1")
 app.include_router(teams.router, prefix="/api/v1")
 app.include_router(invitations.router, prefix="/api/v1")
 app.include_router(notifications.router, prefix="/api/v1")
-app.include_router(tournament.router, prefix="/api/v1")
\ No newline at end of file
+app.include_router(tournament.router, prefix="/api/v1")
+app.include_router(matches.router, prefix="/api/v1")
\ No newline at end of file
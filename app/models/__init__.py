@@ -3,4 +3,4 @@ from .team import Team, TeamMember
 from .tournament import Tournament, Registration, Payment, TournamentStatus
 from .match import Match, Game, MatchProposal
 from .invitation import InvitationStatus, TeamInvitation
-from .notification import Notification
\ No newline at end of file
+from .notification import Notification, NotificationCounter
\ No newline at end of file
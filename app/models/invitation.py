@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import Column, String, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, String, ForeignKey, DateTime, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import enum
@@ -31,4 +31,9 @@ class TeamInvitation(Base):
 
     team = relationship("Team")
     inviter = relationship("User", foreign_keys=[inviter_id])
-    invitee = relationship("User", foreign_keys=[invitee_id])
\ No newline at end of file
+    invitee = relationship("User", foreign_keys=[invitee_id])
+
+    # El barrido de vencidas y las consultas de invitaciones vivas filtran por estado + expiración
+    __table_args__ = (
+        Index("ix_team_invitations_status_expires_at", "status", "expires_at"),
+    )
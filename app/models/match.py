@@ -24,10 +24,12 @@ class Match(Base):
     __tablename__ = "matches"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    tournament_id = Column(UUID(as_uuid=True), ForeignKey("tournaments.id"))
+    tournament_id = Column(UUID(as_uuid=True), ForeignKey("tournaments.id"), index=True)
 
     # --- Lógica de Bracket (Avance Automático) ---
     round_number = Column(Integer)  # Ejemplo: 1 (Ronda 1), 2 (Cuartos), 3 (Semis)
+    # Posición dentro de la ronda (0..n-1): par -> el ganador va a team_a del siguiente, impar -> team_b
+    bracket_position = Column(Integer, nullable=True)
     next_match_id = Column(UUID(as_uuid=True), ForeignKey("matches.id"), nullable=True)
 
     # --- Participantes ---
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, Boolean, JSON
+from sqlalchemy import Column, String, ForeignKey, DateTime, Boolean, JSON, Integer, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from app.core.database import Base
 import uuid
@@ -16,5 +16,36 @@ class Notification(Base):
     message = Column(String)
     data = Column(JSON, nullable=True)  # Datos extra para el frontend (ej: link de redirección)
 
-    is_read = Column(Boolean, default=False)
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
\ No newline at end of file
+    # Invitación asociada (TEAM_INVITE): permite limpiar la notificación por índice y no por JSON
+    invitation_id = Column(
+        UUID(as_uuid=True), ForeignKey("team_invitations.id", ondelete="CASCADE"), nullable=True, index=True
+    )
+
+    is_read = Column(Boolean, nullable=False, default=False, server_default="false")
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+    # Reconciliación del contador de no leídas: solo indexa las no leídas de cada usuario
+    __table_args__ = (
+        Index("ix_notifications_user_id_unread", "user_id", postgresql_where=text("NOT is_read")),
+    )
+
+
+# Bandeja paginada por cursor: (user_id, created_at DESC, id DESC) entrega cada página ya ordenada
+Index(
+    "ix_notifications_user_id_created_at_id",
+    Notification.user_id,
+    Notification.created_at.desc(),
+    Notification.id.desc()
+)
+
+
+class NotificationCounter(Base):
+    """
+    Contador de no leídas por usuario (badge). Lo mantienen triggers por sentencia sobre
+    notifications (INSERT / UPDATE / DELETE), así cualquier escritura, incluidas las masivas,
+    lo deja consistente sin tocar cada servicio.
+    """
+    __tablename__ = "notification_counters"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    unread = Column(Integer, nullable=False, default=0, server_default="0")
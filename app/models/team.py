@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 import uuid
-from sqlalchemy import Column, String, ForeignKey, DateTime, Text
+from sqlalchemy import Column, String, ForeignKey, DateTime, Text, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -44,6 +44,11 @@ class TeamMember(Base):
     team = relationship("Team", back_populates="members")
     user = relationship("User", back_populates="memberships")
 
+    # Un usuario no puede estar dos veces en el mismo equipo (también sirve a los conteos por team_id)
+    __table_args__ = (
+        UniqueConstraint("team_id", "user_id", name="uq_team_members_team_user"),
+    )
+
     @property
     def riot_id_full(self) -> str | None:
         """Devuelve 'Faker#T1' si tiene cuenta vinculada"""
@@ -1,7 +1,9 @@
 import enum
 import uuid
+from datetime import datetime, timezone
 
-from sqlalchemy import Column, UUID, String, Float, Enum, Integer, ForeignKey, DateTime, Text
+from sqlalchemy import Column, UUID, String, Float, Enum, Integer, ForeignKey, DateTime, Text, Index, \
+    UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -24,23 +26,40 @@ class Tournament(Base):
     prize_pool = Column(Float, default=0.0)
     max_teams = Column(Integer, default=16)
 
+    # Cupos ocupados (inscripciones pending/verified); se mantiene en la misma transacción
+    # que cada alta, rechazo o promoción desde la lista de espera
+    registered_teams = Column(Integer, nullable=False, default=0, server_default="0")
+
     start_date = Column(DateTime(timezone=True), nullable=False)
     status = Column(Enum(TournamentStatus), default=TournamentStatus.WAITING)
 
     # Relaciones
     registrations = relationship("Registration", back_populates="tournament", cascade="all, delete-orphan")
 
+    # Índices para la paginación por cursor del listado público (con y sin filtros)
+    __table_args__ = (
+        Index("ix_tournaments_start_date_id", "start_date", "id"),
+        Index("ix_tournaments_status_start_date_id", "status", "start_date", "id"),
+        Index("ix_tournaments_category_start_date_id", "category", "start_date", "id"),
+    )
+
 
 class Registration(Base):
     __tablename__ = "registrations"
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tournament_id = Column(UUID(as_uuid=True), ForeignKey("tournaments.id"))
     team_id = Column(UUID(as_uuid=True), ForeignKey("teams.id"))
-    payment_status = Column(String, default="pending")  # pending, verified, rejected
+    payment_status = Column(String, default="pending")  # pending, verified, rejected, waitlisted
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))  # Orden de la lista de espera
 
     payment_proof = relationship("Payment", back_populates="registration", uselist=False)
     tournament = relationship("Tournament", back_populates="registrations")
 
+    # Un equipo se inscribe una sola vez por torneo
+    __table_args__ = (
+        UniqueConstraint("tournament_id", "team_id", name="uq_registrations_tournament_team"),
+    )
+
 
 class Payment(Base):
     __tablename__ = "payments"
@@ -2,6 +2,7 @@ from datetime import datetime, timezone
 import enum
 
 from sqlalchemy import Column, String, Boolean, UUID, ForeignKey, Enum, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 import uuid
 from app.core.database import Base
@@ -44,6 +45,10 @@ class PlayerAccount(Base):
     region = Column(String)  # IMPORTANTE: 'la1', 'la2' o 'br1'
     puuid = Column(String, unique=True, index=True)
     current_rank = Column(String)  # Validado vía Riot
+
+    # Caché persistida de LEAGUE-V4 (entradas SoloQ/Flex tal cual las devuelve Riot)
+    rank_snapshot = Column(JSONB, nullable=True)
+    rank_updated_at = Column(DateTime(timezone=True), nullable=True)
     is_verified = Column(Boolean, default=False)
 
     user = relationship("User", back_populates="player_accounts")
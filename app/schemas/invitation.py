@@ -1,7 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 from uuid import UUID
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Literal
 
 
 # --- Schemas para Invitaciones ---
@@ -15,6 +15,16 @@ class InvitationResponse(BaseModel):
     expires_at: datetime
 
 
+class BulkInviteRequest(BaseModel):
+    nicks: List[str] = Field(..., min_length=1, max_length=20)
+
+
+class BulkInviteResult(BaseModel):
+    nick: str
+    status: Literal["invited", "not_found", "already_member", "duplicate"]
+    user_id: Optional[UUID] = None
+
+
 # --- Schemas para Notificaciones ---
 class NotificationResponse(BaseModel):
     id: UUID
@@ -26,4 +36,21 @@ class NotificationResponse(BaseModel):
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class NotificationReadRequest(BaseModel):
+    """Sin ids se marcan todas las notificaciones del usuario"""
+    ids: Optional[List[UUID]] = Field(None, max_length=1000)
+
+
+class NotificationDeleteRequest(BaseModel):
+    """Borra por lista de ids, por antigüedad, o ambas (se combinan con AND)"""
+    ids: Optional[List[UUID]] = Field(None, max_length=1000)
+    older_than: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def check_filter(self):
+        if self.ids is None and self.older_than is None:
+            raise ValueError("Indica 'ids' u 'older_than'")
+        return self
@@ -0,0 +1,92 @@
+from pydantic import BaseModel, Field
+from typing import Literal, Optional, List
+from uuid import UUID
+from datetime import datetime
+
+
+class BracketGenerate(BaseModel):
+    """Opciones para generar el bracket de eliminación simple"""
+    seed_by_rank: bool = Field(False, description="Sembrar por el rango cacheado de los jugadores")
+    match_type: Literal["BO1", "BO3", "BO5"] = "BO1"
+
+
+class GameResult(BaseModel):
+    """Resultado de un mapa dentro de una serie"""
+    match_id: UUID
+    winner_team_id: UUID
+    riot_game_id: Optional[str] = None
+
+
+class GameResultBatch(BaseModel):
+    """Varios resultados a la vez (ej: una ronda completa del bracket)"""
+    results: List[GameResult] = Field(..., min_length=1, max_length=512)
+
+
+class GameResultOutcome(BaseModel):
+    match_id: UUID
+    riot_game_id: Optional[str] = None
+    status: Literal["recorded", "duplicate", "match_finished", "invalid_team", "not_found"]
+    series_finished: bool = False
+    winner_id: Optional[UUID] = None
+
+
+# --- Lectura del bracket completo (espectadores) ---
+class BracketTeam(BaseModel):
+    id: UUID
+    name: str
+    tag: str
+    score: int = 0  # Mapas ganados en la serie
+
+
+class BracketMatch(BaseModel):
+    id: UUID
+    position: Optional[int] = None
+    next_match_id: Optional[UUID] = None
+    match_type: Optional[str] = None
+    status: Optional[str] = None
+    scheduled_at: Optional[datetime] = None
+    winner_id: Optional[UUID] = None
+    team_a: Optional[BracketTeam] = None
+    team_b: Optional[BracketTeam] = None
+
+
+class BracketRound(BaseModel):
+    round: int
+    matches: List[BracketMatch]
+
+
+class BracketResponse(BaseModel):
+    tournament_id: UUID
+    rounds: List[BracketRound]
+
+
+# --- Sistema suizo ---
+class SwissRoundGenerate(BaseModel):
+    match_type: Literal["BO1", "BO3", "BO5"] = "BO1"
+
+
+class SwissStanding(BaseModel):
+    position: int
+    team_id: UUID
+    name: str
+    tag: str
+    wins: int
+    losses: int
+    buchholz: int  # Suma de victorias de los rivales enfrentados
+
+
+# --- Agendamiento por ronda ---
+class ScheduleRound(BaseModel):
+    """Horarios por defecto del admin para las series donde los capitanes no coinciden"""
+    default_slots: List[datetime] = []
+
+
+class ScheduledMatch(BaseModel):
+    match_id: UUID
+    scheduled_at: datetime
+    source: Literal["negotiated", "default"]
+
+
+class ScheduleResult(BaseModel):
+    scheduled: List[ScheduledMatch]
+    unscheduled: List[UUID]
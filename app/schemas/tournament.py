@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, computed_field, ConfigDict
-from typing import Optional, List
+from pydantic import BaseModel, Field, ConfigDict
+from typing import List, Literal, Optional
 from uuid import UUID
 from datetime import datetime
 from app.models.tournament import TournamentStatus
@@ -49,17 +49,37 @@ class TournamentListResponse(BaseModel):
     start_date: Optional[datetime]
     status: TournamentStatus
 
-    registrations: List[object] = Field(default=[], exclude=True)
+    # Se lee del contador Tournament.registered_teams (no se cargan las inscripciones)
+    registered_teams_count: int = Field(0, validation_alias="registered_teams")
 
     model_config = ConfigDict(from_attributes=True)
 
-    @computed_field
-    @property
-    def registered_teams_count(self) -> int:
-        """Calcula cuántos equipos hay inscritos"""
-        return len(self.registrations)
-
 
 class TournamentDetailResponse(TournamentListResponse):
     description: Optional[str]
-    created_at: Optional[datetime] = None
\ No newline at end of file
+    created_at: Optional[datetime] = None
+
+class RegistrationCreate(BaseModel):
+    team_id: UUID
+
+
+class RegistrationResponse(BaseModel):
+    id: UUID
+    tournament_id: UUID
+    team_id: UUID
+    payment_status: str  # pending / verified / rejected / waitlisted
+    created_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PaymentReviewBatch(BaseModel):
+    """Revisión masiva de pagos: verifica o rechaza varias inscripciones a la vez"""
+    registration_ids: List[UUID] = Field(..., min_length=1, max_length=512)
+    action: Literal["verify", "reject"] = "verify"
+
+
+class PaymentReviewResult(BaseModel):
+    updated: List[UUID]
+    skipped: List[UUID]  # No existen o no estaban en un estado revisable
+    promoted: List[UUID]  # Inscripciones que salieron de la lista de espera
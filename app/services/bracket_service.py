@@ -0,0 +1,190 @@
+import random
+import uuid
+from collections import defaultdict
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import select, insert, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models.match import Match, Game, MatchStatus
+from app.models.team import Team, TeamMember
+from app.models.tournament import Tournament, Registration
+from app.models.user import PlayerAccount
+from app.schemas.match import BracketGenerate, BracketResponse, BracketRound, BracketMatch, BracketTeam
+from app.services.rank_service import RankService
+from app.services.tournament_service import TournamentService
+
+
+class BracketService:
+    @staticmethod
+    def seed_order(size: int) -> list[int]:
+        """
+        Orden estándar de siembra por posición (0-indexado) para un bracket de 'size'.
+        Ej. 8 -> [0, 7, 3, 4, 1, 6, 2, 5]: el 1 y el 2 solo pueden cruzarse en la final.
+        """
+        order = [0]
+        while len(order) < size:
+            n = len(order) * 2
+            order = [seed for s in order for seed in (s, n - 1 - s)]
+        return order
+
+    @staticmethod
+    def build_matches(tournament_id: UUID, team_ids: list[UUID], match_type: str) -> list[dict]:
+        """
+        Construye en memoria todo el árbol (O(n)) con los next_match_id ya enlazados.
+        team_ids debe venir ordenado por siembra. Los byes se resuelven colocando al
+        equipo directamente en la ronda 2, sin crear un partido de ronda 1 vacío.
+        Las filas salen de la final hacia la ronda 1, así cada FK apunta a una fila previa.
+        """
+        n = len(team_ids)
+        size = 1 << (n - 1).bit_length()
+        rounds = size.bit_length() - 1
+
+        ids = {r: [uuid.uuid4() for _ in range(size >> r)] for r in range(1, rounds + 1)}
+        matches = {
+            (r, pos): {
+                "id": match_id,
+                "tournament_id": tournament_id,
+                "round_number": r,
+                "bracket_position": pos,
+                "next_match_id": ids[r + 1][pos // 2] if r < rounds else None,
+                "team_a_id": None,
+                "team_b_id": None,
+                "match_type": match_type,
+                "status": MatchStatus.WAITING_TEAMS,
+            }
+            for r in range(1, rounds + 1)
+            for pos, match_id in enumerate(ids[r])
+        }
+
+        slots = [team_ids[seed] if seed < n else None for seed in BracketService.seed_order(size)]
+        for pos in range(size // 2):
+            team_a, team_b = slots[2 * pos], slots[2 * pos + 1]
+            if team_a and team_b:
+                matches[(1, pos)].update(team_a_id=team_a, team_b_id=team_b)
+                continue
+
+            # Bye: el equipo pasa directo a la ronda 2
+            del matches[(1, pos)]
+            next_slot = "team_a_id" if pos % 2 == 0 else "team_b_id"
+            matches[(2, pos // 2)][next_slot] = team_a or team_b
+
+        for row in matches.values():
+            if row["team_a_id"] and row["team_b_id"]:
+                row["status"] = MatchStatus.PENDING_CONFIRMATION
+
+        return sorted(matches.values(), key=lambda row: -row["round_number"])
+
+    @staticmethod
+    async def _team_rank_scores(db: AsyncSession, team_ids: list[UUID]) -> dict[UUID, float]:
+        """Promedio del rango cacheado (PlayerAccount.current_rank) de los miembros de cada equipo"""
+        query = (
+            select(TeamMember.team_id, PlayerAccount.current_rank)
+            .join(PlayerAccount, PlayerAccount.user_id == TeamMember.user_id)
+            .where(TeamMember.team_id.in_(team_ids))
+        )
+        scores = defaultdict(list)
+        for team_id, current_rank in (await db.execute(query)).all():
+            scores[team_id].append(RankService.rank_score(current_rank))
+        return {team_id: sum(values) / len(values) for team_id, values in scores.items()}
+
+    @staticmethod
+    async def generate_bracket(db: AsyncSession, tournament_id: UUID, data: BracketGenerate):
+        """Genera el bracket de eliminación simple con las inscripciones verificadas"""
+        # 1. Bloqueamos el torneo para que dos admins no generen el bracket a la vez
+        query = select(Tournament).where(Tournament.id == tournament_id).with_for_update()
+        tournament = (await db.execute(query)).scalars().first()
+        if not tournament:
+            raise HTTPException(status_code=404, detail="Torneo no encontrado")
+
+        existing = select(Match.id).where(Match.tournament_id == tournament_id).limit(1)
+        if (await db.execute(existing)).first():
+            raise HTTPException(status_code=400, detail="El torneo ya tiene un bracket generado")
+
+        # 2. Equipos con pago verificado
+        teams_query = select(Registration.team_id).where(
+            Registration.tournament_id == tournament_id,
+            Registration.payment_status == "verified"
+        )
+        team_ids = list((await db.execute(teams_query)).scalars().all())
+        if len(team_ids) < 2:
+            raise HTTPException(status_code=400, detail="Se necesitan al menos 2 equipos verificados")
+        if len(team_ids) > tournament.max_teams:
+            raise HTTPException(status_code=400, detail="Hay más equipos verificados que cupos en el torneo")
+
+        # 3. Siembra
+        if data.seed_by_rank:
+            scores = await BracketService._team_rank_scores(db, team_ids)
+            team_ids.sort(key=lambda team_id: scores.get(team_id, 0), reverse=True)
+        else:
+            random.shuffle(team_ids)
+
+        # 4. Todo el árbol en un solo INSERT multi-fila
+        rows = BracketService.build_matches(tournament_id, team_ids, data.match_type)
+        await db.execute(insert(Match), rows)
+        await db.commit()
+        TournamentService.invalidate_bracket_cache(tournament_id)
+
+        return {
+            "message": "Bracket generado exitosamente",
+            "teams": len(team_ids),
+            "rounds": max(row["round_number"] for row in rows),
+            "matches_created": len(rows)
+        }
+
+    @staticmethod
+    async def get_bracket(db: AsyncSession, tournament_id: UUID) -> BracketResponse:
+        """
+        Trae todo el bracket en una sola consulta plana (partidos + equipos + marcador
+        por serie) y lo arma en memoria en tiempo lineal, agrupado por ronda.
+        """
+        team_a = aliased(Team)
+        team_b = aliased(Team)
+        query = (
+            select(
+                Match,
+                team_a.name, team_a.tag,
+                team_b.name, team_b.tag,
+                func.count(Game.id).filter(Game.winner_team_id == Match.team_a_id),
+                func.count(Game.id).filter(Game.winner_team_id == Match.team_b_id),
+            )
+            .outerjoin(team_a, team_a.id == Match.team_a_id)
+            .outerjoin(team_b, team_b.id == Match.team_b_id)
+            .outerjoin(Game, Game.match_id == Match.id)
+            .where(Match.tournament_id == tournament_id)
+            .group_by(Match.id, team_a.id, team_b.id)
+        )
+        rows = (await db.execute(query)).all()
+        if not rows:
+            raise HTTPException(status_code=404, detail="El torneo aún no tiene bracket")
+
+        rounds: dict[int, list[BracketMatch]] = defaultdict(list)
+        for match, a_name, a_tag, b_name, b_tag, a_score, b_score in rows:
+            rounds[match.round_number or 0].append(BracketMatch(
+                id=match.id,
+                position=match.bracket_position,
+                next_match_id=match.next_match_id,
+                match_type=match.match_type,
+                status=match.status.value if match.status else None,
+                scheduled_at=match.scheduled_at,
+                winner_id=match.winner_id,
+                team_a=BracketTeam(id=match.team_a_id, name=a_name, tag=a_tag, score=a_score)
+                if match.team_a_id else None,
+                team_b=BracketTeam(id=match.team_b_id, name=b_name, tag=b_tag, score=b_score)
+                if match.team_b_id else None,
+            ))
+
+        # Las posiciones ya vienen numeradas: ubicamos cada partido en su casilla (sin ordenar)
+        bracket = []
+        for round_number in sorted(rounds):
+            matches = rounds[round_number]
+            if all(m.position is not None for m in matches):
+                slots = [None] * (max(m.position for m in matches) + 1)
+                for m in matches:
+                    slots[m.position] = m
+                matches = [m for m in slots if m is not None]
+            bracket.append(BracketRound(round=round_number, matches=matches))
+
+        return BracketResponse(tournament_id=tournament_id, rounds=bracket)
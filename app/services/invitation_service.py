@@ -1,15 +1,25 @@
 import secrets
+import uuid
+from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func, delete
+from sqlalchemy import func, delete, update, insert, exists, literal, and_
+from app.core.config import settings
 from fastapi import HTTPException
 from datetime import datetime, timezone, timedelta
 from app.models.invitation import TeamInvitation, InvitationStatus
 from app.models.team import Team, TeamMember
 from app.models.notification import Notification
 from app.models.user import User
+from app.schemas.invitation import BulkInviteResult
+from app.services.notification_service import NotificationService
 
 class InvitationService:
+    # Cupo máximo de integrantes por equipo
+    MAX_MEMBERS = 6
+
+    # Llave del advisory lock de Postgres que garantiza un solo barrido a la vez
+    SWEEP_LOCK_ID = 719_201
 
     @staticmethod
     async def create_invitation_link(db: AsyncSession, team_id: str, inviter_id: str):
@@ -48,6 +58,7 @@ class InvitationService:
         # 3. Crear invitación
         token = secrets.token_urlsafe(16)
         invite = TeamInvitation(
+            id=uuid.uuid4(),  # Lo necesitamos antes del flush para enlazar la notificación
             team_id=team_id,
             inviter_id=inviter_id,
             invitee_id=target_user.id,
@@ -55,75 +66,239 @@ class InvitationService:
             expires_at=datetime.now(timezone.utc) + timedelta(days=2),
         )
         db.add(invite)
+        await db.flush()  # La notificación referencia la invitación (FK)
 
         # 4. CREAR NOTIFICACIÓN
         # Obtenemos nombre del equipo para el mensaje
         team = await db.get(Team, team_id)
-        notification = Notification(
-            user_id=target_user.id,
-            type="TEAM_INVITE",
-            title="Invitación de Equipo",
-            message=f"Te han invitado a unirte al equipo {team.name}",
-            data={"team_id": str(team_id), "token": token}
-        )
-        db.add(notification)
+        await NotificationService.create_many(db, [NotificationService.build(
+            target_user.id, "TEAM_INVITE", "Invitación de Equipo",
+            f"Te han invitado a unirte al equipo {team.name}",
+            data={"team_id": str(team_id), "token": token},
+            invitation_id=invite.id
+        )])
 
         await db.commit()
         return {"message": f"Invitación enviada a {target_user_nick}"}
 
     @staticmethod
-    async def accept_invitation(db: AsyncSession, token: str, user_id: UUID):
-        """Lógica para procesar la aceptación de invitación a equipo"""
+    async def invite_users_bulk(db: AsyncSession, team_id: UUID, inviter_id: UUID, nicks: list[str]):
+        """
+        Invita a varios usuarios por nick con un número constante de sentencias:
+        equipo, usuarios + membresía (un IN con LEFT JOIN) y dos INSERT multi-fila
+        (invitaciones y notificaciones). Devuelve el resultado por nick.
+        """
+        team = (await db.execute(select(Team.name, Team.captain_id).where(Team.id == team_id))).first()
+        if not team:
+            raise HTTPException(status_code=404, detail="Equipo no encontrado")
+        if team.captain_id != inviter_id:
+            raise HTTPException(status_code=403, detail="Solo el capitán puede invitar jugadores")
 
-        # 1. Validar token (Existencia, Estado y Expiración)
-        query = select(TeamInvitation).where(
-            TeamInvitation.token == token,
-            TeamInvitation.status == InvitationStatus.PENDING,
-            TeamInvitation.expires_at > datetime.now(timezone.utc)
+        users_query = (
+            select(User.id, User.internal_nick, TeamMember.user_id.label("member_id"))
+            .outerjoin(TeamMember, and_(TeamMember.user_id == User.id, TeamMember.team_id == team_id))
+            .where(User.internal_nick.in_(set(nicks)))
         )
-        invite = (await db.execute(query)).scalars().first()
+        users = {row.internal_nick: row for row in (await db.execute(users_query)).all()}
 
-        if not invite:
-            raise HTTPException(status_code=404, detail="Invitación inválida, expirada o ya utilizada")
+        now = datetime.now(timezone.utc)
+        results, invitations, notifications, seen = [], [], [], set()
+        for nick in nicks:
+            user = users.get(nick)
+            if nick in seen:
+                results.append(BulkInviteResult(nick=nick, status="duplicate"))
+                continue
+            seen.add(nick)
+            if not user:
+                results.append(BulkInviteResult(nick=nick, status="not_found"))
+                continue
+            if user.member_id:
+                results.append(BulkInviteResult(nick=nick, status="already_member", user_id=user.id))
+                continue
 
-        # 2. VALIDACIÓN CRÍTICA: ¿El usuario ya está en el equipo?
-        # Esto previene duplicados antes de chequear cupos
-        member_check = select(TeamMember).where(
-            TeamMember.team_id == invite.team_id,
-            TeamMember.user_id == user_id
+            invitation_id, token = uuid.uuid4(), secrets.token_urlsafe(16)
+            invitations.append({
+                "id": invitation_id,
+                "team_id": team_id,
+                "inviter_id": inviter_id,
+                "invitee_id": user.id,
+                "token": token,
+                "status": InvitationStatus.PENDING,
+                "created_at": now,
+                "expires_at": now + timedelta(days=2),
+            })
+            notifications.append(NotificationService.build(
+                user.id, "TEAM_INVITE", "Invitación de Equipo",
+                f"Te han invitado a unirte al equipo {team.name}",
+                data={"team_id": str(team_id), "token": token},
+                invitation_id=invitation_id
+            ))
+            results.append(BulkInviteResult(nick=nick, status="invited", user_id=user.id))
+
+        if invitations:
+            await db.execute(insert(TeamInvitation), invitations)
+            await NotificationService.create_many(db, notifications)
+            await db.commit()
+        return results
+
+    @staticmethod
+    async def accept_invitation(db: AsyncSession, token: str, user_id: UUID):
+        """
+        Lógica para procesar la aceptación de invitación a equipo, sin carreras y en 2 viajes:
+        1. SELECT ... FOR UPDATE de la invitación y del equipo: dos aceptaciones
+           simultáneas al mismo equipo se serializan aquí.
+        2. Una sola sentencia con CTEs que, ya con el lock tomado, cuenta integrantes,
+           verifica membresía, marca la invitación, inserta al miembro y limpia la
+           notificación, solo si hay cupo y el usuario no estaba en el equipo.
+        """
+        # 1. Validar token (Existencia, Estado y Expiración) y bloquear el equipo
+        lock_query = (
+            select(TeamInvitation.id, TeamInvitation.team_id)
+            .join(Team, Team.id == TeamInvitation.team_id)
+            .where(
+                TeamInvitation.token == token,
+                TeamInvitation.status == InvitationStatus.PENDING,
+                TeamInvitation.expires_at > datetime.now(timezone.utc)
+            )
+            .with_for_update()
         )
-        if (await db.execute(member_check)).scalars().first():
-            raise HTTPException(status_code=400, detail="Ya eres miembro de este equipo")
+        invite = (await db.execute(lock_query)).first()
 
-        # 3. Validar Cupos (Max 6)
-        count_query = select(func.count()).select_from(TeamMember).where(TeamMember.team_id == invite.team_id)
-        current_members = (await db.execute(count_query)).scalar()
+        if not invite:
+            raise HTTPException(status_code=404, detail="Invitación inválida, expirada o ya utilizada")
 
-        if current_members >= 6:
-            raise HTTPException(status_code=400, detail="El equipo ya está lleno (6/6)")
+        # 2. Estado del equipo (con snapshot posterior al lock)
+        state = select(
+            select(func.count()).select_from(TeamMember)
+            .where(TeamMember.team_id == invite.team_id)
+            .scalar_subquery().label("members"),
+            exists().where(
+                TeamMember.team_id == invite.team_id,
+                TeamMember.user_id == user_id
+            ).label("is_member")
+        ).cte("state")
 
-        # 4. Añadir a TeamMember
-        new_member = TeamMember(team_id=invite.team_id, user_id=user_id)
-        db.add(new_member)
+        # Actualizar la invitación solo si hay cupo y no es miembro (registramos quién usó el token)
+        accepted = (
+            update(TeamInvitation)
+            .where(
+                TeamInvitation.id == invite.id,
+                state.c.members < InvitationService.MAX_MEMBERS,
+                ~state.c.is_member
+            )
+            .values(status=InvitationStatus.ACCEPTED, invitee_id=user_id)
+            .returning(TeamInvitation.team_id)
+            .cte("accepted")
+        )
 
-        # 5. Actualizar estado de la invitación
-        invite.status = InvitationStatus.ACCEPTED
-        invite.invitee_id = user_id  # Registramos quién usó el token
+        # Añadir a TeamMember
+        joined = (
+            insert(TeamMember)
+            .from_select(
+                ["id", "team_id", "user_id", "joined_at"],
+                select(
+                    literal(uuid.uuid4(), TeamMember.id.type),
+                    accepted.c.team_id,
+                    literal(user_id, TeamMember.user_id.type),
+                    literal(datetime.now(timezone.utc), TeamMember.joined_at.type)
+                )
+            )
+            .returning(TeamMember.id)
+            .cte("joined")
+        )
 
-        # 6. LIMPIEZA AUTOMÁTICA DE NOTIFICACIONES
-        # Buscamos y eliminamos la notificación asociada a este token para este usuario
-        # Usamos cast de JSON si es necesario, pero SQLAlchemy suele manejarlo bien así:
-        try:
-            cleanup_query = delete(Notification).where(
+        # LIMPIEZA AUTOMÁTICA DE NOTIFICACIONES: la asociada a esta invitación (índice en invitation_id)
+        cleanup = (
+            delete(Notification)
+            .where(
                 Notification.user_id == user_id,
-                Notification.type == "TEAM_INVITE",
-                # Postgres JSONB: busca dentro del objeto data la clave token
-                Notification.data['token'].astext == token
+                Notification.invitation_id == invite.id,
+                exists(select(joined.c.id))
+            )
+            .returning(Notification.id)
+            .cte("cleanup")
+        )
+
+        # Se referencian todos los CTEs para que SQLAlchemy los emita en la sentencia
+        query = select(
+            state.c.members,
+            state.c.is_member,
+            select(func.count()).select_from(joined).scalar_subquery().label("joined"),
+            select(func.count()).select_from(cleanup).scalar_subquery().label("cleaned")
+        )
+        result = (await db.execute(query)).one()
+
+        if not result.joined:
+            await db.rollback()
+            if result.is_member:
+                raise HTTPException(status_code=400, detail="Ya eres miembro de este equipo")
+            raise HTTPException(
+                status_code=400,
+                detail=f"El equipo ya está lleno ({InvitationService.MAX_MEMBERS}/{InvitationService.MAX_MEMBERS})"
             )
-            await db.execute(cleanup_query)
-        except Exception as e:
-            # No queremos que falle el ingreso al equipo si falla el borrado de notificación
-            print(f"Warning: No se pudo borrar la notificación automática: {e}")
 
         await db.commit()
-        return {"message": "¡Bienvenido al equipo! Has sido añadido exitosamente."}
\ No newline at end of file
+        return {"message": "¡Bienvenido al equipo! Has sido añadido exitosamente."}
+
+    @staticmethod
+    async def expire_invitations(db: AsyncSession, batch_size: int | None = None) -> dict:
+        """
+        Marca como EXPIRED las invitaciones PENDING vencidas y borra sus notificaciones.
+        - Lotes acotados (índice (status, expires_at)); cada lote es una sola sentencia con CTEs.
+        - Cada lote toma pg_try_advisory_xact_lock: si otro worker ya está barriendo,
+          este se retira sin hacer nada.
+        """
+        batch_size = batch_size or settings.INVITATION_SWEEP_BATCH_SIZE
+        stats = {"expired": 0, "notifications_deleted": 0, "batches": 0, "locked_out": False}
+
+        while True:
+            locked = (await db.execute(
+                select(func.pg_try_advisory_xact_lock(InvitationService.SWEEP_LOCK_ID))
+            )).scalar()
+            if not locked:
+                await db.rollback()
+                stats["locked_out"] = True
+                break
+
+            due = (
+                select(TeamInvitation.id)
+                .where(
+                    TeamInvitation.status == InvitationStatus.PENDING,
+                    TeamInvitation.expires_at <= datetime.now(timezone.utc)
+                )
+                .order_by(TeamInvitation.expires_at)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)  # No esperamos a una aceptación en curso
+                .cte("due")
+            )
+            expired = (
+                update(TeamInvitation)
+                .where(TeamInvitation.id.in_(select(due.c.id)))
+                .values(status=InvitationStatus.EXPIRED)
+                .returning(TeamInvitation.id)
+                .cte("expired")
+            )
+            cleanup = (
+                delete(Notification)
+                .where(Notification.invitation_id.in_(select(expired.c.id)))
+                .returning(Notification.id)
+                .cte("cleanup")
+            )
+            query = select(
+                select(func.count()).select_from(expired).scalar_subquery().label("expired"),
+                select(func.count()).select_from(cleanup).scalar_subquery().label("deleted")
+            )
+            result = (await db.execute(query)).one()
+            await db.commit()
+
+            stats["batches"] += 1
+            stats["expired"] += result.expired
+            stats["notifications_deleted"] += result.deleted
+            if result.expired < batch_size:
+                break
+
+        print(
+            f"Invitaciones: {stats['expired']} vencidas, "
+            f"{stats['notifications_deleted']} notificaciones borradas en {stats['batches']} lotes"
+        )
+        return stats
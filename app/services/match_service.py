@@ -0,0 +1,143 @@
+import uuid
+from collections import defaultdict
+
+from fastapi import HTTPException
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.match import Match, Game, MatchStatus
+from app.schemas.match import GameResult, GameResultOutcome
+from app.services.tournament_service import TournamentService
+
+
+class MatchService:
+    # Victorias necesarias para cerrar la serie
+    WINS_NEEDED = {"BO1": 1, "BO3": 2, "BO5": 3}
+
+    # Reintentos cuando otro envío concurrente registra el mismo riot_game_id
+    RECORD_ATTEMPTS = 3
+
+    @staticmethod
+    async def record_games(db: AsyncSession, results: list[GameResult]) -> list[GameResultOutcome]:
+        """
+        Registra resultados de mapas, cierra las series ganadas y avanza a los ganadores
+        en el bracket. Todo en una transacción corta con un número constante de sentencias:
+        1. SELECT ... FOR UPDATE de las series involucradas (orden por id, sin deadlocks)
+        2. Victorias actuales por serie + riot_game_id ya registrados
+        3. INSERT multi-fila de los mapas nuevos (ON CONFLICT (riot_game_id) DO NOTHING)
+        4. SELECT ... FOR UPDATE de los siguientes partidos y actualización de slots
+        Como toda escritura de mapas pasa por el lock de su serie, dos envíos
+        concurrentes para la misma serie se serializan y no duplican victorias.
+        El mismo riot_game_id enviado a la vez para series distintas no comparte lock:
+        si el INSERT omite algún mapa se hace rollback y se recalcula todo con el mapa
+        ya confirmado por el otro envío (queda como "duplicate" y no suma victorias).
+        """
+        for _ in range(MatchService.RECORD_ATTEMPTS):
+            outcomes = await MatchService._record_once(db, results)
+            if outcomes is not None:
+                return outcomes
+        raise HTTPException(status_code=409, detail="Resultados en conflicto con otro envío; reintenta")
+
+    @staticmethod
+    async def _record_once(db: AsyncSession, results: list[GameResult]) -> list[GameResultOutcome] | None:
+        """Un intento de record_games; devuelve None (tras rollback) si hubo choque de riot_game_id"""
+        match_ids = sorted({r.match_id for r in results})
+
+        # 1. Bloqueamos las series
+        lock_query = select(Match).where(Match.id.in_(match_ids)).order_by(Match.id).with_for_update()
+        matches = {m.id: m for m in (await db.execute(lock_query)).scalars().all()}
+
+        # 2. Estado actual: victorias por equipo y mapas ya cargados
+        wins_query = (
+            select(Game.match_id, Game.winner_team_id, func.count())
+            .where(Game.match_id.in_(matches.keys()))
+            .group_by(Game.match_id, Game.winner_team_id)
+        )
+        wins = defaultdict(int)
+        for match_id, team_id, count in (await db.execute(wins_query)).all():
+            wins[(match_id, team_id)] = count
+
+        riot_ids = {r.riot_game_id for r in results if r.riot_game_id}
+        seen_riot_ids = set()
+        if riot_ids:
+            existing_query = select(Game.riot_game_id).where(Game.riot_game_id.in_(riot_ids))
+            seen_riot_ids = set((await db.execute(existing_query)).scalars().all())
+
+        # 3. Recorremos los resultados en orden, como si llegaran uno por uno
+        outcomes = []
+        new_games = []
+        finished = []
+        for result in results:
+            outcome = GameResultOutcome(
+                match_id=result.match_id, riot_game_id=result.riot_game_id, status="recorded"
+            )
+            outcomes.append(outcome)
+            match = matches.get(result.match_id)
+
+            if match is None:
+                outcome.status = "not_found"
+                continue
+            if result.riot_game_id and result.riot_game_id in seen_riot_ids:
+                outcome.status = "duplicate"
+                continue
+            if match.status == MatchStatus.FINISHED:
+                outcome.status = "match_finished"
+                outcome.winner_id = match.winner_id
+                continue
+            if not match.team_a_id or not match.team_b_id or \
+                    result.winner_team_id not in (match.team_a_id, match.team_b_id):
+                outcome.status = "invalid_team"
+                continue
+
+            if result.riot_game_id:
+                seen_riot_ids.add(result.riot_game_id)
+            new_games.append({
+                "id": uuid.uuid4(),
+                "match_id": match.id,
+                "riot_game_id": result.riot_game_id,
+                "winner_team_id": result.winner_team_id
+            })
+
+            wins[(match.id, result.winner_team_id)] += 1
+            if wins[(match.id, result.winner_team_id)] >= MatchService.WINS_NEEDED.get(match.match_type, 1):
+                match.winner_id = result.winner_team_id
+                match.status = MatchStatus.FINISHED
+                finished.append(match)
+                outcome.series_finished = True
+                outcome.winner_id = match.winner_id
+            else:
+                match.status = MatchStatus.ONGOING
+
+        if new_games:
+            query = (
+                insert(Game)
+                .on_conflict_do_nothing(index_elements=["riot_game_id"])
+                .returning(Game.id)
+            )
+            inserted = (await db.execute(query, new_games)).scalars().all()
+            if len(inserted) < len(new_games):
+                await db.rollback()
+                return None
+
+        # 4. Avance: el ganador ocupa el slot que le corresponde en el siguiente partido
+        advancing = [m for m in finished if m.next_match_id]
+        if advancing:
+            next_ids = sorted({m.next_match_id for m in advancing})
+            next_query = select(Match).where(Match.id.in_(next_ids)).order_by(Match.id).with_for_update()
+            next_matches = {m.id: m for m in (await db.execute(next_query)).scalars().all()}
+
+            for match in advancing:
+                next_match = next_matches[match.next_match_id]
+                if (match.bracket_position or 0) % 2 == 0:
+                    next_match.team_a_id = match.winner_id
+                else:
+                    next_match.team_b_id = match.winner_id
+
+                if next_match.team_a_id and next_match.team_b_id and \
+                        next_match.status == MatchStatus.WAITING_TEAMS:
+                    next_match.status = MatchStatus.PENDING_CONFIRMATION
+
+        await db.commit()
+        TournamentService.invalidate_bracket_cache(*{m.tournament_id for m in matches.values()})
+        return outcomes
@@ -0,0 +1,116 @@
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import select, insert, func, literal, bindparam, cast, JSON, Text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.notification_hub import notification_hub
+from app.models.notification import Notification
+from app.models.team import TeamMember
+from app.models.tournament import Registration
+
+
+class NotificationService:
+    # Inscripciones cuyos integrantes reciben los avisos del torneo
+    TOURNAMENT_AUDIENCE = ("pending", "verified")
+
+    @staticmethod
+    def build(user_id: UUID, type: str, title: str, message: str, data: Optional[dict] = None, **extra) -> dict:
+        """Fila lista para un INSERT multi-fila (ids y fecha se generan aquí, no en el flush)"""
+        return {
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "type": type,
+            "title": title,
+            "message": message,
+            "data": data,
+            "is_read": False,
+            "created_at": datetime.now(timezone.utc),
+            **extra
+        }
+
+    @staticmethod
+    async def create_many(db: AsyncSession, rows: list[dict]):
+        """
+        Inserta las notificaciones y las publica por NOTIFY, dentro de la transacción del
+        llamador (se entregan al hacer commit).
+        Un solo INSERT ... SELECT FROM unnest(<un arreglo por columna>): con asyncpg una
+        lista de dicts se ejecuta fila por fila (executemany) y cada ejecución dispara los
+        triggers por sentencia del contador de no leídas.
+        """
+        if not rows:
+            return
+        keys = set().union(*rows)
+        columns = [c for c in Notification.__table__.columns if c.key in keys]
+
+        arrays = []
+        for c in columns:
+            items = [row.get(c.key) for row in rows]
+            if isinstance(c.type, JSON):
+                # JSON viaja como texto y se castea en el SELECT
+                items = [None if item is None else json.dumps(item) for item in items]
+                arrays.append(bindparam(c.key, items, type_=ARRAY(Text)))
+            else:
+                arrays.append(bindparam(c.key, items, type_=ARRAY(c.type)))
+
+        source = func.unnest(*arrays).table_valued(*(c.key for c in columns)).render_derived()
+        query = insert(Notification).from_select(
+            [c.key for c in columns],
+            select(*(cast(source.c[c.key], c.type) if isinstance(c.type, JSON) else source.c[c.key] for c in columns))
+        )
+        await db.execute(query)
+        await notification_hub.publish(db, rows)
+
+    @staticmethod
+    async def fan_out_tournament(
+            db: AsyncSession,
+            tournament_id: UUID,
+            type: str,
+            title: str,
+            message: str,
+            data: Optional[dict] = None,
+            statuses: Iterable[str] = TOURNAMENT_AUDIENCE
+    ) -> int:
+        """
+        Una notificación por integrante de cada equipo inscrito, sin traer filas a Python:
+        INSERT ... SELECT sobre registrations JOIN team_members (destinatarios únicos)
+        + un pg_notify con lo insertado. No hace commit.
+        """
+        recipients = (
+            select(TeamMember.user_id)
+            .join(Registration, Registration.team_id == TeamMember.team_id)
+            .where(
+                Registration.tournament_id == tournament_id,
+                Registration.payment_status.in_(tuple(statuses))
+            )
+            .distinct()
+            .subquery()
+        )
+        rows = select(
+            func.gen_random_uuid(),
+            recipients.c.user_id,
+            literal(type),
+            literal(title),
+            literal(message),
+            literal(data, Notification.data.type),
+            literal(False),
+            func.now()
+        )
+        query = (
+            insert(Notification)
+            .from_select(
+                ["id", "user_id", "type", "title", "message", "data", "is_read", "created_at"], rows
+            )
+            .returning(
+                Notification.id, Notification.user_id, Notification.type, Notification.title,
+                Notification.message, Notification.data, Notification.is_read, Notification.created_at
+            )
+        )
+        inserted = (await db.execute(query)).all()
+        await notification_hub.publish(db, inserted)
+        return len(inserted)
+
@@ -0,0 +1,213 @@
+import asyncio
+import time
+import httpx
+from datetime import datetime, timezone, timedelta
+from typing import Optional
+from uuid import UUID
+from fastapi import HTTPException
+from sqlalchemy import update, select, values, column, or_, String, DateTime, Uuid
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.user import PlayerAccount
+from app.services.riot_service import RiotService
+
+# puuid -> (fetched_at, entradas LEAGUE-V4). La entrada vive hasta el máximo "stale" permitido;
+# la frescura (RANK_CACHE_TTL_SECONDS) se evalúa con fetched_at.
+_rank_cache = TTLCache(
+    maxsize=settings.RANK_CACHE_MAX_SIZE,
+    ttl=settings.RANK_CACHE_MAX_STALE_SECONDS
+)
+
+# Refrescos en segundo plano en curso (uno por PUUID)
+_refreshing: dict[str, asyncio.Task] = {}
+
+
+class RankService:
+    TIERS = [
+        "IRON", "BRONZE", "SILVER", "GOLD", "PLATINUM",
+        "EMERALD", "DIAMOND", "MASTER", "GRANDMASTER", "CHALLENGER"
+    ]
+    DIVISIONS = {"IV": 0, "III": 1, "II": 2, "I": 3}
+
+    @staticmethod
+    def rank_score(current_rank: str | None) -> int:
+        """Valor numérico de un current_rank ('GOLD II' -> 14) para ordenar. Unranked = 0"""
+        tier, _, division = (current_rank or "").partition(" ")
+        if tier not in RankService.TIERS:
+            return 0
+        return 1 + RankService.TIERS.index(tier) * 4 + RankService.DIVISIONS.get(division, 0)
+
+    @staticmethod
+    def format_rank(entries: list) -> str:
+        """Convierte las entradas de Riot en el texto de current_rank (ej: 'GOLD II')"""
+        for entry in entries or []:
+            if entry.get("queueType") == "RANKED_SOLO_5x5":
+                return f"{entry['tier']} {entry['rank']}"
+        return "Unranked"
+
+    @staticmethod
+    def remember(puuid: str, entries: list, fetched_at: datetime):
+        """Guarda el rango en la capa en memoria"""
+        age = (datetime.now(timezone.utc) - fetched_at).total_seconds()
+        _rank_cache.set(puuid, (fetched_at, entries), ttl=settings.RANK_CACHE_MAX_STALE_SECONDS - age)
+
+    @staticmethod
+    async def refresh(db: AsyncSession, region: str, puuid: str) -> list:
+        """Consulta Riot y actualiza ambas capas (memoria + snapshot en PlayerAccount)"""
+        entries = await RiotService.get_rank_data_by_puuid(region, puuid)
+        fetched_at = datetime.now(timezone.utc)
+        RankService.remember(puuid, entries, fetched_at)
+
+        query = (
+            update(PlayerAccount)
+            .where(PlayerAccount.puuid == puuid)
+            .values(
+                current_rank=RankService.format_rank(entries),
+                rank_snapshot=entries,
+                rank_updated_at=fetched_at
+            )
+        )
+        await db.execute(query)
+        await db.commit()
+        return entries
+
+    @staticmethod
+    async def _background_refresh(region: str, puuid: str):
+        # La sesión del request ya está cerrada: abrimos una propia
+        try:
+            async with AsyncSessionLocal() as db:
+                await RankService.refresh(db, region, puuid)
+        except Exception as e:
+            print(f"Warning: No se pudo refrescar el rango de {puuid}: {e}")
+
+    @staticmethod
+    def _schedule_refresh(region: str, puuid: str):
+        if puuid in _refreshing:
+            return
+        task = asyncio.create_task(RankService._background_refresh(region, puuid))
+        _refreshing[puuid] = task
+        task.add_done_callback(lambda _: _refreshing.pop(puuid, None))
+
+    @staticmethod
+    async def get_ranks(db: AsyncSession, account: PlayerAccount) -> list:
+        """
+        Stale-while-revalidate:
+        - Fresco (< TTL): se devuelve directo de memoria o del snapshot en DB.
+        - Vencido pero dentro del máximo stale: se devuelve y se refresca en segundo plano.
+        - Sin datos o demasiado viejo: se consulta Riot en línea.
+        """
+        cached = _rank_cache.get(account.puuid)
+        if cached is None and account.rank_updated_at and account.rank_snapshot is not None:
+            cached = (account.rank_updated_at, account.rank_snapshot)
+            RankService.remember(account.puuid, account.rank_snapshot, account.rank_updated_at)
+
+        if cached is not None:
+            fetched_at, entries = cached
+            age = (datetime.now(timezone.utc) - fetched_at).total_seconds()
+            if age < settings.RANK_CACHE_TTL_SECONDS:
+                return entries
+            if age < settings.RANK_CACHE_MAX_STALE_SECONDS:
+                RankService._schedule_refresh(account.region, account.puuid)
+                return entries
+
+        try:
+            return await RankService.refresh(db, account.region, account.puuid)
+        except HTTPException:
+            # Si Riot falla preferimos un dato viejo antes que un error
+            if cached is not None:
+                return cached[1]
+            raise
+
+    @staticmethod
+    async def refresh_stale_accounts(
+            db: AsyncSession,
+            batch_size: Optional[int] = None,
+            start_after: Optional[UUID] = None
+    ) -> dict:
+        """
+        Refresca en lotes los rangos de todas las cuentas vinculadas cuyo snapshot venció.
+        - Recorre player_accounts por keyset (id) y solo toma cuentas vencidas, así que
+          si el proceso se reinicia retoma donde quedó (o desde start_after).
+        - Concurrencia acotada por región; los límites de Riot los aplica RiotService.
+        - Un solo UPDATE ... FROM (VALUES ...) por lote.
+        """
+        batch_size = batch_size or settings.RANK_REFRESH_BATCH_SIZE
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.RANK_CACHE_TTL_SECONDS)
+        semaphores: dict[str, asyncio.Semaphore] = {}
+        stats = {"processed": 0, "updated": 0, "failed": 0, "last_id": start_after}
+        started = time.monotonic()
+
+        async def fetch(account_id: UUID, region: str, puuid: str):
+            semaphore = semaphores.setdefault(
+                region, asyncio.Semaphore(settings.RANK_REFRESH_CONCURRENCY_PER_REGION)
+            )
+            async with semaphore:
+                try:
+                    entries = await RiotService.get_rank_data_by_puuid(region, puuid)
+                except (HTTPException, httpx.HTTPError) as e:
+                    print(f"Warning: No se pudo refrescar el rango de {puuid}: {e}")
+                    return None
+            fetched_at = datetime.now(timezone.utc)
+            RankService.remember(puuid, entries, fetched_at)
+            return account_id, RankService.format_rank(entries), entries, fetched_at
+
+        last_id = start_after
+        while True:
+            query = (
+                select(PlayerAccount.id, PlayerAccount.region, PlayerAccount.puuid)
+                .where(
+                    PlayerAccount.puuid.isnot(None),
+                    or_(PlayerAccount.rank_updated_at.is_(None), PlayerAccount.rank_updated_at < cutoff)
+                )
+                .order_by(PlayerAccount.id)
+                .limit(batch_size)
+            )
+            if last_id is not None:
+                query = query.where(PlayerAccount.id > last_id)
+
+            batch = (await db.execute(query)).all()
+            if not batch:
+                break
+
+            results = await asyncio.gather(*(fetch(*row) for row in batch))
+            rows = [r for r in results if r is not None]
+
+            if rows:
+                ranks = values(
+                    column("id", Uuid),
+                    column("current_rank", String),
+                    column("rank_snapshot", JSONB),
+                    column("rank_updated_at", DateTime(timezone=True)),
+                    name="ranks"
+                ).data(rows)
+                bulk_update = (
+                    update(PlayerAccount)
+                    .where(PlayerAccount.id == ranks.c.id)
+                    .values(
+                        current_rank=ranks.c.current_rank,
+                        rank_snapshot=ranks.c.rank_snapshot,
+                        rank_updated_at=ranks.c.rank_updated_at
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                await db.execute(bulk_update)
+            await db.commit()
+
+            last_id = batch[-1].id
+            stats["processed"] += len(batch)
+            stats["updated"] += len(rows)
+            stats["failed"] += len(batch) - len(rows)
+            stats["last_id"] = last_id
+
+            elapsed = time.monotonic() - started
+            stats["accounts_per_min"] = round(stats["processed"] / elapsed * 60, 1) if elapsed else 0.0
+            print(
+                f"Rangos: {stats['processed']} procesadas ({stats['failed']} fallidas), "
+                f"{stats['accounts_per_min']} cuentas/min, último id {last_id}"
+            )
+
+        return stats
@@ -0,0 +1,290 @@
+from datetime import datetime, timezone
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import select, update, values, column, func, Integer, Uuid
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.team import Team
+from app.models.tournament import Tournament, TournamentStatus, Registration, Payment
+from app.schemas.tournament import PaymentReviewBatch, PaymentReviewResult
+from app.services.notification_service import NotificationService
+from app.services.tournament_service import TournamentService
+
+
+class RegistrationService:
+    # Estados que ocupan cupo (los cuenta Tournament.registered_teams)
+    SLOT_STATUSES = ("pending", "verified")
+    WAITLISTED = "waitlisted"
+    REJECTED = "rejected"
+
+    @staticmethod
+    async def register_team(db: AsyncSession, tournament_id: UUID, team_id: UUID, user_id: UUID) -> Registration:
+        """
+        Inscribe un equipo sin carreras aunque lleguen cientos de capitanes a la vez:
+        - Camino rápido: un UPDATE condicional toma el cupo
+          (registered_teams < max_teams); Postgres serializa los UPDATE sobre la fila
+          y re-evalúa la condición, así que nunca se excede max_teams.
+        - Torneo lleno: se bloquea la fila (FOR UPDATE, igual que el rechazo) y el
+          equipo queda en lista de espera.
+        - La restricción única (tournament_id, team_id) evita doble inscripción;
+          si choca se hace rollback y el cupo tomado se devuelve.
+        - Un equipo rechazado puede volver a inscribirse: se reutiliza su fila
+          (ON CONFLICT DO UPDATE solo si está en 'rejected') y vuelve al final de la cola.
+        """
+        team = (await db.execute(select(Team.captain_id).where(Team.id == team_id))).first()
+        if not team:
+            raise HTTPException(status_code=404, detail="Equipo no encontrado")
+        if team.captain_id != user_id:
+            raise HTTPException(status_code=403, detail="Solo el capitán puede inscribir al equipo")
+
+        take_slot = (
+            update(Tournament)
+            .where(
+                Tournament.id == tournament_id,
+                Tournament.status == TournamentStatus.WAITING,
+                Tournament.registered_teams < Tournament.max_teams
+            )
+            .values(registered_teams=Tournament.registered_teams + 1)
+            .returning(Tournament.id)
+            .execution_options(synchronize_session=False)
+        )
+        payment_status = "pending"
+        if (await db.execute(take_slot)).first() is None:
+            lock_query = select(Tournament).where(Tournament.id == tournament_id).with_for_update()
+            tournament = (await db.execute(lock_query)).scalars().first()
+            if not tournament:
+                raise HTTPException(status_code=404, detail="Torneo no encontrado")
+            if tournament.status != TournamentStatus.WAITING:
+                raise HTTPException(status_code=400, detail="Las inscripciones del torneo están cerradas")
+
+            # Con el lock, un rechazo pudo haber liberado un cupo mientras esperábamos
+            if tournament.registered_teams < tournament.max_teams:
+                tournament.registered_teams += 1
+            else:
+                payment_status = RegistrationService.WAITLISTED
+
+        query = insert(Registration).values(
+            tournament_id=tournament_id,
+            team_id=team_id,
+            payment_status=payment_status,
+            created_at=datetime.now(timezone.utc)
+        )
+        query = query.on_conflict_do_update(
+            index_elements=["tournament_id", "team_id"],
+            set_={"payment_status": query.excluded.payment_status, "created_at": query.excluded.created_at},
+            where=Registration.payment_status == RegistrationService.REJECTED
+        ).returning(Registration)
+        registration = (await db.execute(query)).scalars().first()
+        if registration is None:
+            await db.rollback()
+            raise HTTPException(status_code=409, detail="El equipo ya está inscrito en este torneo")
+
+        await db.commit()
+        TournamentService.invalidate_cache(tournament_id)
+        return registration
+
+    @staticmethod
+    async def _release_slots(db: AsyncSession, freed: dict[UUID, int]) -> list:
+        """
+        Entrega los cupos liberados ({torneo: cantidad}) a las listas de espera por orden
+        de llegada y descuenta del contador los que no se pudieron cubrir.
+        Dos sentencias sin importar cuántos torneos o cupos haya.
+        Debe llamarse con las filas de los torneos bloqueadas (FOR UPDATE).
+        Devuelve (id, tournament_id, captain_id, tournament_name) de cada promovida.
+        """
+        freed_slots = values(
+            column("tournament_id", Uuid), column("slots", Integer), name="freed_slots"
+        ).data(list(freed.items()))
+        waitlist = (
+            select(
+                Registration.id,
+                Registration.tournament_id,
+                func.row_number().over(
+                    partition_by=Registration.tournament_id,
+                    order_by=(Registration.created_at, Registration.id)
+                ).label("position")
+            )
+            .where(
+                Registration.tournament_id.in_(freed.keys()),
+                Registration.payment_status == RegistrationService.WAITLISTED
+            )
+            .subquery()
+        )
+        next_in_line = (
+            select(waitlist.c.id)
+            .join(freed_slots, freed_slots.c.tournament_id == waitlist.c.tournament_id)
+            .where(waitlist.c.position <= freed_slots.c.slots)
+        )
+        promote = (
+            update(Registration)
+            .where(
+                Registration.id.in_(next_in_line),
+                Registration.team_id == Team.id,
+                Registration.tournament_id == Tournament.id
+            )
+            .values(payment_status="pending")
+            .returning(Registration.id, Registration.tournament_id, Team.captain_id, Tournament.name)
+            .execution_options(synchronize_session=False)
+        )
+        promoted = (await db.execute(promote)).all()
+
+        remaining = dict(freed)
+        for row in promoted:
+            remaining[row.tournament_id] -= 1
+        remaining = [(tournament_id, slots) for tournament_id, slots in remaining.items() if slots]
+        if remaining:
+            unfilled = values(
+                column("tournament_id", Uuid), column("slots", Integer), name="unfilled"
+            ).data(remaining)
+            free = (
+                update(Tournament)
+                .where(Tournament.id == unfilled.c.tournament_id)
+                .values(registered_teams=Tournament.registered_teams - unfilled.c.slots)
+                .execution_options(synchronize_session=False)
+            )
+            await db.execute(free)
+        return promoted
+
+    @staticmethod
+    def _notifications(rows: list, type: str, title: str, message: str) -> list[dict]:
+        """Filas de notificación para el capitán de cada inscripción (para un INSERT multi-fila)"""
+        return [
+            NotificationService.build(
+                row.captain_id, type, title, message.format(tournament=row.name),
+                data={"tournament_id": str(row.tournament_id), "registration_id": str(row.id)}
+            )
+            for row in rows
+        ]
+
+    @staticmethod
+    def _promoted_notifications(promoted: list) -> list[dict]:
+        return RegistrationService._notifications(
+            promoted, "WAITLIST_PROMOTED", "Cupo liberado",
+            "Tu equipo salió de la lista de espera de {tournament}"
+        )
+
+    @staticmethod
+    async def reject_registration(db: AsyncSession, registration_id: UUID) -> dict:
+        """Rechaza una inscripción; si ocupaba cupo, sube al primer equipo de la lista de espera"""
+        tournament_id = (await db.execute(
+            select(Registration.tournament_id).where(Registration.id == registration_id)
+        )).scalar()
+        if not tournament_id:
+            raise HTTPException(status_code=404, detail="Inscripción no encontrada")
+
+        # Mismo lock que el camino lento de register_team: altas y rechazos no se cruzan
+        await db.execute(select(Tournament.id).where(Tournament.id == tournament_id).with_for_update())
+
+        query = (
+            select(Registration)
+            .where(Registration.id == registration_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        registration = (await db.execute(query)).scalars().first()
+        if registration.payment_status == RegistrationService.REJECTED:
+            raise HTTPException(status_code=400, detail="La inscripción ya fue rechazada")
+
+        held_slot = registration.payment_status in RegistrationService.SLOT_STATUSES
+        registration.payment_status = RegistrationService.REJECTED
+        await db.flush()
+
+        promoted = []
+        if held_slot:
+            promoted = await RegistrationService._release_slots(db, {tournament_id: 1})
+            if promoted:
+                await NotificationService.create_many(db, RegistrationService._promoted_notifications(promoted))
+
+        await db.commit()
+        TournamentService.invalidate_cache(tournament_id)
+        TournamentService.invalidate_bracket_cache(tournament_id)
+        return {
+            "message": "Inscripción rechazada",
+            "promoted_registration_id": promoted[0].id if promoted else None
+        }
+
+    @staticmethod
+    async def review_payments(db: AsyncSession, data: PaymentReviewBatch, admin_id: UUID) -> PaymentReviewResult:
+        """
+        Verifica o rechaza en lote los pagos de varias inscripciones, en una transacción
+        y con un número constante de sentencias:
+        - verify: UPDATE registrations ... RETURNING + UPDATE payments
+        - reject: lock de torneos + UPDATE registrations ... RETURNING + promoción de la
+          lista de espera (2 sentencias en total)
+        - Un INSERT multi-fila con las notificaciones para los capitanes
+        Solo se tocan inscripciones en estado revisable; el resto se informa en 'skipped'.
+        """
+        registration_ids = list(dict.fromkeys(data.registration_ids))
+
+        if data.action == "verify":
+            new_status, reviewable = "verified", ("pending",)
+        else:
+            new_status, reviewable = RegistrationService.REJECTED, RegistrationService.SLOT_STATUSES
+            # Los rechazos liberan cupos: mismo orden de locks que reject_registration
+            lock_query = (
+                select(Tournament.id)
+                .where(Tournament.id.in_(
+                    select(Registration.tournament_id).where(Registration.id.in_(registration_ids))
+                ))
+                .order_by(Tournament.id)
+                .with_for_update()
+            )
+            await db.execute(lock_query)
+
+        review = (
+            update(Registration)
+            .where(
+                Registration.id.in_(registration_ids),
+                Registration.payment_status.in_(reviewable),
+                Registration.team_id == Team.id,
+                Registration.tournament_id == Tournament.id
+            )
+            .values(payment_status=new_status)
+            .returning(Registration.id, Registration.tournament_id, Team.captain_id, Tournament.name)
+            .execution_options(synchronize_session=False)
+        )
+        reviewed = (await db.execute(review)).all()
+        reviewed_ids = [row.id for row in reviewed]
+
+        promoted = []
+        notifications = []
+        if reviewed and data.action == "verify":
+            # verified_at es una columna sin zona horaria: guardamos UTC
+            payments = (
+                update(Payment)
+                .where(Payment.registration_id.in_(reviewed_ids))
+                .values(verified_at=datetime.now(timezone.utc).replace(tzinfo=None), verified_by=admin_id)
+                .execution_options(synchronize_session=False)
+            )
+            await db.execute(payments)
+            notifications = RegistrationService._notifications(
+                reviewed, "PAYMENT_VERIFIED", "Pago verificado",
+                "Tu inscripción en {tournament} está confirmada"
+            )
+        elif reviewed:
+            freed = {}
+            for row in reviewed:
+                freed[row.tournament_id] = freed.get(row.tournament_id, 0) + 1
+            promoted = await RegistrationService._release_slots(db, freed)
+            notifications = RegistrationService._notifications(
+                reviewed, "PAYMENT_REJECTED", "Pago rechazado",
+                "Tu pago para {tournament} fue rechazado"
+            ) + RegistrationService._promoted_notifications(promoted)
+
+        await NotificationService.create_many(db, notifications)
+
+        await db.commit()
+        tournament_ids = {row.tournament_id for row in reviewed}
+        for tournament_id in tournament_ids:
+            TournamentService.invalidate_cache(tournament_id)
+        # La tabla suiza solo cuenta inscripciones verificadas
+        TournamentService.invalidate_bracket_cache(*tournament_ids)
+
+        reviewed_set = set(reviewed_ids)
+        return PaymentReviewResult(
+            updated=reviewed_ids,
+            skipped=[r for r in registration_ids if r not in reviewed_set],
+            promoted=[row.id for row in promoted]
+        )
@@ -1,6 +1,8 @@
 import httpx
 from fastapi import HTTPException
 from app.core.config import settings
+from app.core.rate_limit import RateGovernor
+from app.core.singleflight import SingleFlight
 
 
 class RiotService:
@@ -13,33 +15,115 @@ class RiotService:
         "BR": "br1"
     }
 
+    # Host de enrutamiento regional (Account-V1) + plataformas de LoL
+    ROUTING_HOSTS = ("americas", *REGION_MAP.values())
+
+    # Un cliente con pool de conexiones (keep-alive / HTTP2) por host de Riot
+    _clients: dict[str, httpx.AsyncClient] = {}
+
+    # Token buckets por plataforma y por método, alimentados por las cabeceras de Riot
+    rate_governor = RateGovernor(settings.RIOT_DEFAULT_APP_RATE_LIMIT)
+
+    # Peticiones idénticas concurrentes comparten una sola llamada a Riot
+    _in_flight = SingleFlight()
+
+    @classmethod
+    def _build_client(cls, host: str) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=f"https://{host}.api.riotgames.com",
+            headers=cls.HEADERS,
+            http2=settings.RIOT_HTTP2,
+            limits=httpx.Limits(
+                max_connections=settings.RIOT_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.RIOT_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.RIOT_KEEPALIVE_EXPIRY_SECONDS
+            ),
+            timeout=httpx.Timeout(
+                settings.RIOT_READ_TIMEOUT_SECONDS,
+                connect=settings.RIOT_CONNECT_TIMEOUT_SECONDS
+            )
+        )
+
+    @classmethod
+    async def startup(cls):
+        """Crea los clientes compartidos (se llama desde el lifespan de FastAPI)"""
+        for host in cls.ROUTING_HOSTS:
+            if host not in cls._clients:
+                cls._clients[host] = cls._build_client(host)
+
+    @classmethod
+    async def shutdown(cls):
+        """Cierra todas las conexiones abiertas al apagar la app"""
+        clients, cls._clients = cls._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+    @classmethod
+    def _get_client(cls, host: str) -> httpx.AsyncClient:
+        if not host:
+            raise HTTPException(status_code=400, detail="Región de Riot no soportada")
+        client = cls._clients.get(host)
+        if client is None:
+            # Fuera del lifespan (scripts, workers) lo creamos bajo demanda
+            client = cls._clients[host] = cls._build_client(host)
+        return client
+
+    @classmethod
+    async def _get(cls, host: str, method: str, path: str) -> httpx.Response:
+        """GET a Riot; llamadas concurrentes al mismo (método, host, recurso) se coalescen"""
+        client = cls._get_client(host)
+        return await cls._in_flight.do((method, host, path), lambda: cls._request(client, host, method, path))
+
+    @classmethod
+    async def _request(cls, client: httpx.AsyncClient, host: str, method: str, path: str) -> httpx.Response:
+        """
+        GET respetando los límites de Riot: espera turno en el gobernador y,
+        si aun así recibimos 429, reintenta tras el Retry-After indicado.
+        """
+        for _ in range(settings.RIOT_MAX_RETRIES + 1):
+            await cls.rate_governor.acquire(host, method)
+            response = await client.get(path)
+            cls.rate_governor.update(host, method, response.status_code, response.headers)
+            if response.status_code != 429:
+                break
+        return response
+
+    @staticmethod
+    def _json(response: httpx.Response):
+        """Decodifica el cuerpo; un 5xx en HTML desde el edge de Riot no es JSON"""
+        try:
+            return response.json()
+        except ValueError:
+            raise HTTPException(
+                status_code=502,
+                detail=f"Respuesta inválida de Riot ({response.status_code})"
+            )
+
     @classmethod
     async def get_riot_account(cls, game_name: str, tag_line: str):
         """Busca el PUUID por Riot ID (Nick#Tag)"""
-        url = f"https://americas.api.riotgames.com/riot/account/v1/accounts/by-riot-id/{game_name}/{tag_line}"
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=cls.HEADERS)
-            if response.status_code != 200:
-                raise HTTPException(status_code=404, detail="Cuenta de Riot no encontrada")
-            return response.json()  # Devuelve puuid, gameName, tagLine
+        response = await cls._get(
+            "americas",
+            "account-v1.by-riot-id",
+            f"/riot/account/v1/accounts/by-riot-id/{game_name}/{tag_line}"
+        )
+        if response.status_code != 200:
+            raise HTTPException(status_code=404, detail="Cuenta de Riot no encontrada")
+        return cls._json(response)  # Devuelve puuid, gameName, tagLine
 
     @classmethod
     async def get_summoner_data(cls, region: str, puuid: str):
         """Obtiene ID de invocador y nivel"""
         platform = cls.REGION_MAP.get(region)
-        url = f"https://{platform}.api.riotgames.com/lol/summoner/v4/summoners/by-puuid/{puuid}"
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=cls.HEADERS)
-            return response.json()
+        response = await cls._get(platform, "summoner-v4.by-puuid", f"/lol/summoner/v4/summoners/by-puuid/{puuid}")
+        return cls._json(response)
 
     @classmethod
     async def get_rank_data(cls, region: str, summoner_id: str):
         """Obtiene el rango (SoloQ/Flex)"""
         platform = cls.REGION_MAP.get(region)
-        url = f"https://{platform}.api.riotgames.com/lol/league/v4/entries/by-summoner/{summoner_id}"
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=cls.HEADERS)
-            return response.json()
+        response = await cls._get(platform, "league-v4.by-summoner", f"/lol/league/v4/entries/by-summoner/{summoner_id}")
+        return cls._json(response)
 
     @classmethod
     async def get_rank_data_by_puuid(cls, region: str, puuid: str):
@@ -49,16 +133,13 @@ class RiotService:
         """
         platform = cls.REGION_MAP.get(region)
         # Endpoint: /lol/league/v4/entries/by-puuid/{encryptedPUUID}
-        url = f"https://{platform}.api.riotgames.com/lol/league/v4/entries/by-puuid/{puuid}"
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=cls.HEADERS)
+        response = await cls._get(platform, "league-v4.by-puuid", f"/lol/league/v4/entries/by-puuid/{puuid}")
 
-            if response.status_code != 200:
-                error_info = response.json().get("status", {})
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Error de Riot ({error_info.get('status_code')}): {error_info.get('message')}"
-                )
+        if response.status_code != 200:
+            error_info = cls._json(response).get("status", {})
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Error de Riot ({error_info.get('status_code')}): {error_info.get('message')}"
+            )
 
-            return response.json()
\ No newline at end of file
+        return cls._json(response)
@@ -0,0 +1,215 @@
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from sqlalchemy import select, update, values, column, or_, DateTime, Uuid
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.match import Match, MatchProposal, MatchStatus, SchedulingType
+from app.models.team import Team
+from app.schemas.match import ScheduleRound, ScheduleResult, ScheduledMatch
+from app.services.notification_service import NotificationService
+from app.services.tournament_service import TournamentService
+
+
+class _TeamCalendar:
+    """Índice de intervalos ocupados de un equipo (ordenados, sin solapes) con búsqueda binaria"""
+
+    def __init__(self):
+        self.starts: list[datetime] = []
+        self.ends: list[datetime] = []
+
+    def is_free(self, start: datetime, end: datetime) -> bool:
+        # Sin solapes, solo el último intervalo que empieza antes de 'end' puede chocar
+        i = bisect_left(self.starts, end)
+        return i == 0 or self.ends[i - 1] <= start
+
+    def book(self, start: datetime, end: datetime):
+        """
+        Reserva fusionando con los intervalos que se solapen: las series ya agendadas
+        (manuales o aceptadas) pueden solaparse entre sí y is_free depende de que no haya solapes.
+        """
+        i = bisect_left(self.starts, start)
+        if i > 0 and self.ends[i - 1] >= start:
+            i -= 1
+            start = self.starts[i]
+        j = i
+        while j < len(self.starts) and self.starts[j] <= end:
+            end = max(end, self.ends[j])
+            j += 1
+        self.starts[i:j] = [start]
+        self.ends[i:j] = [end]
+
+
+class SchedulingService:
+    # Duración reservada por serie
+    SLOT_DURATION = {
+        "BO1": timedelta(hours=1),
+        "BO3": timedelta(hours=2, minutes=30),
+        "BO5": timedelta(hours=4),
+    }
+
+    @staticmethod
+    def _to_utc(value: datetime) -> datetime:
+        # scheduled_at se guarda como UTC sin zona horaria
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    @staticmethod
+    def _parse_slots(slots, duration: timedelta) -> list[tuple[datetime, datetime]]:
+        """
+        proposed_slots admite ["2026-03-01T20:00:00Z", ...] (inicio) o
+        [{"start": ..., "end": ...}, ...] (ventana de disponibilidad).
+        """
+        intervals = []
+        for slot in slots or []:
+            try:
+                if isinstance(slot, dict):
+                    start = SchedulingService._to_utc(datetime.fromisoformat(slot["start"]))
+                    end = SchedulingService._to_utc(datetime.fromisoformat(slot["end"])) if slot.get("end") \
+                        else start + duration
+                else:
+                    start = SchedulingService._to_utc(datetime.fromisoformat(slot))
+                    end = start + duration
+            except (KeyError, TypeError, ValueError):
+                continue
+            intervals.append((start, end))
+        return intervals
+
+    @staticmethod
+    def _common_starts(a: list, b: list, duration: timedelta) -> list[datetime]:
+        """Inicios posibles donde ambas propuestas se solapan al menos 'duration'"""
+        starts = set()
+        for start_a, end_a in a:
+            for start_b, end_b in b:
+                start, end = max(start_a, start_b), min(end_a, end_b)
+                if end - start >= duration:
+                    starts.add(start)
+        return sorted(starts)
+
+    @staticmethod
+    def _place(matches: list, options: dict, defaults: list[datetime], calendars: dict) -> tuple[list, list]:
+        """
+        Asigna horarios en memoria. Primero las series más restringidas (menos opciones
+        negociadas); las que no tienen ninguna (FIXED o sin coincidencia) aceptan cualquier
+        horario por defecto, así que van al final para no quitarle su único horario a otra.
+        """
+        def priority(match):
+            count = len(options[match.id])
+            return count == 0, count, match.round_number or 0, match.bracket_position or 0
+
+        scheduled, unscheduled = [], []
+        for match in sorted(matches, key=priority):
+            duration = SchedulingService.SLOT_DURATION.get(match.match_type, timedelta(hours=1))
+            teams = [calendars[t] for t in (match.team_a_id, match.team_b_id) if t]
+
+            chosen = None
+            for source, candidates in (("negotiated", options[match.id]), ("default", defaults)):
+                for start in candidates:
+                    if all(calendar.is_free(start, start + duration) for calendar in teams):
+                        chosen = (start, source)
+                        break
+                if chosen:
+                    break
+
+            if not chosen:
+                unscheduled.append(match.id)
+                continue
+
+            start, source = chosen
+            for calendar in teams:
+                calendar.book(start, start + duration)
+            scheduled.append(ScheduledMatch(match_id=match.id, scheduled_at=start, source=source))
+        return scheduled, unscheduled
+
+    @staticmethod
+    async def schedule_round(db: AsyncSession, tournament_id: UUID, data: ScheduleRound) -> ScheduleResult:
+        """
+        Agenda en una pasada todas las series PENDING_CONFIRMATION del torneo.
+        - NEGOTIATED: intersección de las propuestas de ambos capitanes.
+        - Si no coinciden (o FIXED): primer horario por defecto del admin libre para ambos.
+        - Ningún equipo queda con dos series solapadas (índice de intervalos por equipo).
+        Se resuelven primero las series con menos opciones negociadas y se persiste con un solo UPDATE.
+        """
+        matches_query = (
+            select(Match)
+            .where(
+                Match.tournament_id == tournament_id,
+                Match.status == MatchStatus.PENDING_CONFIRMATION
+            )
+            .order_by(Match.id)
+            .with_for_update()
+        )
+        matches = (await db.execute(matches_query)).scalars().all()
+        if not matches:
+            return ScheduleResult(scheduled=[], unscheduled=[])
+
+        team_ids = {t for m in matches for t in (m.team_a_id, m.team_b_id) if t}
+
+        # Capitanes (las propuestas vienen por usuario) y calendario ya ocupado de cada equipo
+        captains_query = select(Team.id, Team.captain_id).where(Team.id.in_(team_ids))
+        captain_of = {captain_id: team_id for team_id, captain_id in (await db.execute(captains_query)).all()}
+
+        proposals_query = (
+            select(MatchProposal.match_id, MatchProposal.proposer_id, MatchProposal.proposed_slots)
+            .where(MatchProposal.match_id.in_([m.id for m in matches]))
+            .order_by(MatchProposal.id)
+        )
+        proposals = defaultdict(dict)
+        for match_id, proposer_id, slots in (await db.execute(proposals_query)).all():
+            team_id = captain_of.get(proposer_id)
+            if team_id:
+                proposals[match_id][team_id] = slots
+
+        busy_query = select(Match.team_a_id, Match.team_b_id, Match.scheduled_at, Match.match_type).where(
+            Match.status == MatchStatus.SCHEDULED,
+            Match.scheduled_at.isnot(None),
+            or_(Match.team_a_id.in_(team_ids), Match.team_b_id.in_(team_ids))
+        )
+        calendars = defaultdict(_TeamCalendar)
+        for team_a, team_b, scheduled_at, match_type in (await db.execute(busy_query)).all():
+            end = scheduled_at + SchedulingService.SLOT_DURATION.get(match_type, timedelta(hours=1))
+            for team_id in (team_a, team_b):
+                if team_id in team_ids:
+                    calendars[team_id].book(scheduled_at, end)
+
+        defaults = sorted(SchedulingService._to_utc(slot) for slot in data.default_slots)
+
+        # Opciones negociadas por serie
+        options = {}
+        for match in matches:
+            duration = SchedulingService.SLOT_DURATION.get(match.match_type, timedelta(hours=1))
+            options[match.id] = []
+            if match.scheduling_type == SchedulingType.NEGOTIATED:
+                by_team = proposals.get(match.id, {})
+                options[match.id] = SchedulingService._common_starts(
+                    SchedulingService._parse_slots(by_team.get(match.team_a_id), duration),
+                    SchedulingService._parse_slots(by_team.get(match.team_b_id), duration),
+                    duration
+                )
+
+        scheduled, unscheduled = SchedulingService._place(matches, options, defaults, calendars)
+
+        if scheduled:
+            assignments = values(
+                column("id", Uuid), column("scheduled_at", DateTime()), name="assignments"
+            ).data([(s.match_id, s.scheduled_at) for s in scheduled])
+            bulk_update = (
+                update(Match)
+                .where(Match.id == assignments.c.id)
+                .values(scheduled_at=assignments.c.scheduled_at, status=MatchStatus.SCHEDULED)
+                .execution_options(synchronize_session=False)
+            )
+            await db.execute(bulk_update)
+            await NotificationService.fan_out_tournament(
+                db, tournament_id, "ROUND_SCHEDULED", "Nuevos horarios",
+                f"Se agendaron {len(scheduled)} series del torneo", data={"tournament_id": str(tournament_id)},
+                statuses=("verified",)
+            )
+        await db.commit()
+
+        if scheduled:
+            TournamentService.invalidate_bracket_cache(tournament_id)
+        return ScheduleResult(scheduled=scheduled, unscheduled=unscheduled)
@@ -0,0 +1,220 @@
+import asyncio
+import uuid
+from typing import Optional
+from uuid import UUID
+
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy import select, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.match import Match, MatchStatus
+from app.models.team import Team
+from app.models.tournament import Tournament, Registration
+from app.schemas.match import SwissRoundGenerate, SwissStanding
+from app.services.tournament_service import TournamentService
+
+
+class PairingBudgetExceeded(Exception):
+    """La búsqueda agotó su presupuesto sin decidir si existe un emparejamiento sin revanchas"""
+
+
+class SwissService:
+    # Límite total de nodos explorados al emparejar una ronda (evita explosiones combinatorias)
+    PAIRING_BUDGET = 200_000
+
+    @staticmethod
+    def compute_standings(n: int, team_a: np.ndarray, team_b: np.ndarray, winner: np.ndarray):
+        """
+        Tabla del suizo con arreglos (sin recorrer partido por partido en Python).
+        team_a / team_b / winner son índices de equipo; team_b = -1 es un bye, winner = -1 sin ganador.
+        Devuelve (orden, victorias, derrotas, buchholz, matriz de enfrentados, tuvo_bye).
+        """
+        wins = np.bincount(winner[winner >= 0], minlength=n)
+        paired = team_b >= 0
+
+        played = np.zeros((n, n), dtype=bool)
+        played[team_a[paired], team_b[paired]] = True
+        played[team_b[paired], team_a[paired]] = True
+
+        games = np.bincount(team_a, minlength=n) + np.bincount(team_b[paired], minlength=n)
+        buchholz = played.astype(np.int64) @ wins
+
+        had_bye = np.zeros(n, dtype=bool)
+        had_bye[team_a[~paired]] = True
+
+        # Victorias desc, luego Buchholz desc (lexsort usa la última llave como principal)
+        order = np.lexsort((-buchholz, -wins))
+        return order, wins, games - wins, buchholz, played, had_bye
+
+    @staticmethod
+    def _pair_dfs(blocked: np.ndarray, available: np.ndarray, pairs: list, budget: list) -> bool:
+        if not available.any():
+            return True
+        budget[0] -= 1
+        if budget[0] < 0:
+            return False
+
+        # El mejor equipo libre se cruza con el siguiente más cercano en la tabla que no haya enfrentado
+        i = int(np.argmax(available))
+        available[i] = False
+        for j in np.flatnonzero(available & ~blocked[i]):
+            available[j] = False
+            pairs.append((i, int(j)))
+            if SwissService._pair_dfs(blocked, available, pairs, budget):
+                return True
+            pairs.pop()
+            available[j] = True
+        available[i] = True
+        return False
+
+    @staticmethod
+    def pair(order: np.ndarray, played: np.ndarray, had_bye: np.ndarray) -> tuple[list[tuple[int, int]], Optional[int]]:
+        """
+        Emparejamiento sin revanchas sobre la tabla ordenada.
+        Con número impar, el bye va al peor clasificado que aún no lo haya tenido.
+        Todas las opciones de bye comparten un mismo presupuesto de nodos.
+        Lanza ValueError si no existe emparejamiento válido y PairingBudgetExceeded si
+        el presupuesto se agotó antes de saberlo.
+        """
+        n = len(order)
+        blocked = played[np.ix_(order, order)]
+
+        if n % 2 == 0:
+            bye_options = [None]
+        else:
+            bye_options = [p for p in range(n - 1, -1, -1) if not had_bye[order[p]]] or list(range(n - 1, -1, -1))
+
+        budget = [SwissService.PAIRING_BUDGET]
+        for bye in bye_options:
+            available = np.ones(n, dtype=bool)
+            if bye is not None:
+                available[bye] = False
+            pairs = []
+            if SwissService._pair_dfs(blocked, available, pairs, budget):
+                bye_team = int(order[bye]) if bye is not None else None
+                return [(int(order[i]), int(order[j])) for i, j in pairs], bye_team
+            if budget[0] < 0:
+                raise PairingBudgetExceeded()
+
+        raise ValueError("No existe un emparejamiento sin revanchas")
+
+    @staticmethod
+    async def _load(db: AsyncSession, tournament_id: UUID):
+        """Equipos verificados (índice estable) + partidos del torneo en arreglos"""
+        teams_query = (
+            select(Team.id, Team.name, Team.tag)
+            .join(Registration, Registration.team_id == Team.id)
+            .where(
+                Registration.tournament_id == tournament_id,
+                Registration.payment_status == "verified"
+            )
+            .order_by(Team.name)
+        )
+        teams = (await db.execute(teams_query)).all()
+        index = {team.id: i for i, team in enumerate(teams)}
+
+        matches_query = select(
+            Match.round_number, Match.team_a_id, Match.team_b_id, Match.winner_id,
+            Match.status, Match.next_match_id
+        ).where(Match.tournament_id == tournament_id)
+        matches = (await db.execute(matches_query)).all()
+
+        # Partidos contra equipos que ya no están verificados no cuentan (ni como bye)
+        finished = [
+            m for m in matches
+            if m.status == MatchStatus.FINISHED
+            and m.team_a_id in index
+            and (m.team_b_id is None or m.team_b_id in index)
+        ]
+        team_a = np.array([index[m.team_a_id] for m in finished], dtype=np.int64)
+        team_b = np.array([index.get(m.team_b_id, -1) for m in finished], dtype=np.int64)
+        winner = np.array([index.get(m.winner_id, -1) for m in finished], dtype=np.int64)
+        return teams, matches, team_a, team_b, winner
+
+    @staticmethod
+    async def get_standings(db: AsyncSession, tournament_id: UUID) -> list[SwissStanding]:
+        teams, _, team_a, team_b, winner = await SwissService._load(db, tournament_id)
+        if not teams:
+            raise HTTPException(status_code=404, detail="El torneo no tiene equipos verificados")
+
+        order, wins, losses, buchholz, _, _ = SwissService.compute_standings(len(teams), team_a, team_b, winner)
+        return [
+            SwissStanding(
+                position=position + 1,
+                team_id=teams[i].id,
+                name=teams[i].name,
+                tag=teams[i].tag,
+                wins=int(wins[i]),
+                losses=int(losses[i]),
+                buchholz=int(buchholz[i])
+            )
+            for position, i in enumerate(order)
+        ]
+
+    @staticmethod
+    async def generate_round(db: AsyncSession, tournament_id: UUID, data: SwissRoundGenerate):
+        """Empareja la siguiente ronda suiza y crea todos sus partidos en un solo INSERT"""
+        query = select(Tournament).where(Tournament.id == tournament_id).with_for_update()
+        if not (await db.execute(query)).scalars().first():
+            raise HTTPException(status_code=404, detail="Torneo no encontrado")
+
+        teams, matches, team_a, team_b, winner = await SwissService._load(db, tournament_id)
+        if len(teams) < 2:
+            raise HTTPException(status_code=400, detail="Se necesitan al menos 2 equipos verificados")
+        if any(m.next_match_id for m in matches):
+            raise HTTPException(status_code=400, detail="El torneo ya usa un bracket de eliminación")
+        if any(m.status != MatchStatus.FINISHED for m in matches):
+            raise HTTPException(status_code=400, detail="La ronda actual aún no termina")
+
+        order, _, _, _, played, had_bye = SwissService.compute_standings(len(teams), team_a, team_b, winner)
+        try:
+            # Búsqueda CPU-bound: fuera del event loop para no frenar al resto del worker (SSE, WS)
+            pairs, bye = await asyncio.to_thread(SwissService.pair, order, played, had_bye)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="No hay emparejamientos posibles sin revancha")
+        except PairingBudgetExceeded:
+            raise HTTPException(
+                status_code=409,
+                detail="La búsqueda de emparejamientos excedió su límite; empareja la ronda manualmente"
+            )
+
+        round_number = max((m.round_number or 0 for m in matches), default=0) + 1
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "tournament_id": tournament_id,
+                "round_number": round_number,
+                "bracket_position": board,
+                "team_a_id": teams[a].id,
+                "team_b_id": teams[b].id,
+                "winner_id": None,
+                "match_type": data.match_type,
+                "status": MatchStatus.PENDING_CONFIRMATION,
+            }
+            for board, (a, b) in enumerate(pairs)
+        ]
+        if bye is not None:
+            # El bye cuenta como victoria directa
+            rows.append({
+                "id": uuid.uuid4(),
+                "tournament_id": tournament_id,
+                "round_number": round_number,
+                "bracket_position": len(pairs),
+                "team_a_id": teams[bye].id,
+                "team_b_id": None,
+                "winner_id": teams[bye].id,
+                "match_type": data.match_type,
+                "status": MatchStatus.FINISHED,
+            })
+
+        await db.execute(insert(Match), rows)
+        await db.commit()
+        TournamentService.invalidate_bracket_cache(tournament_id)
+
+        return {
+            "message": f"Ronda {round_number} generada",
+            "round": round_number,
+            "matches_created": len(rows),
+            "bye_team_id": teams[bye].id if bye is not None else None
+        }
@@ -1,14 +1,46 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from fastapi import HTTPException
 from uuid import UUID
 
-from sqlalchemy.orm import selectinload
-
-from app.models.tournament import Tournament
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.response_cache import response_cache
+from app.models.tournament import Tournament, TournamentStatus
 from app.schemas.tournament import TournamentCreate, TournamentUpdate
+from app.services.notification_service import NotificationService
 
 class TournamentService:
+    # Namespaces de la caché de respuestas públicas
+    LIST_CACHE_NAMESPACE = "tournaments"
+
+    @staticmethod
+    def cache_namespace(tournament_id: UUID) -> str:
+        return f"tournament:{tournament_id}"
+
+    @staticmethod
+    def invalidate_cache(tournament_id: Optional[UUID] = None):
+        """
+        Invalida el listado público y, si se indica, el detalle del torneo.
+        Llamar después de cualquier commit que cambie torneos o inscripciones.
+        """
+        namespaces = [TournamentService.LIST_CACHE_NAMESPACE]
+        if tournament_id is not None:
+            namespaces.append(TournamentService.cache_namespace(tournament_id))
+        response_cache.bump(*namespaces)
+
+    @staticmethod
+    def bracket_cache_namespace(tournament_id: UUID) -> str:
+        return f"bracket:{tournament_id}"
+
+    @staticmethod
+    def invalidate_bracket_cache(*tournament_ids: UUID):
+        """Llamar después de cualquier commit que cambie un Match o Game del torneo"""
+        response_cache.bump(*(TournamentService.bracket_cache_namespace(t) for t in tournament_ids))
+
     @staticmethod
     async def create_tournament(db: AsyncSession, data: TournamentCreate):
         new_tournament = Tournament(
@@ -23,6 +55,7 @@ class TournamentService:
         db.add(new_tournament)
         await db.commit()
         await db.refresh(new_tournament)
+        TournamentService.invalidate_cache()
         return new_tournament
 
     @staticmethod
@@ -35,28 +68,65 @@ class TournamentService:
             raise HTTPException(status_code=404, detail="Torneo no encontrado")
 
         update_data = data.model_dump(exclude_unset=True)
+        starting = (
+            update_data.get("status") == TournamentStatus.ONGOING
+            and tournament.status != TournamentStatus.ONGOING
+        )
         for key, value in update_data.items():
             setattr(tournament, key, value)
 
+        if starting:
+            # Aviso a todos los integrantes de los equipos verificados (un solo INSERT ... SELECT)
+            await NotificationService.fan_out_tournament(
+                db, tournament_id, "TOURNAMENT_START", "¡Comienza el torneo!",
+                f"{tournament.name} ya está en curso", data={"tournament_id": str(tournament_id)},
+                statuses=("verified",)
+            )
+
         await db.commit()
         await db.refresh(tournament)
+        TournamentService.invalidate_cache(tournament_id)
         return tournament
 
     @staticmethod
-    async def get_all_tournaments(db: AsyncSession, skip: int = 0, limit: int = 20):
+    async def get_all_tournaments(
+            db: AsyncSession,
+            skip: int = 0,
+            limit: int = 20,
+            cursor: Optional[str] = None,
+            status: Optional[TournamentStatus] = None,
+            category: Optional[str] = None
+    ):
         """
-        Obtiene lista de torneos con paginación básica.
-        Carga 'registrations' solo para hacer el conteo.
+        Obtiene lista de torneos ordenada por (start_date, id) descendente.
+        - Con cursor: paginación keyset (camino rápido, usa los índices compuestos).
+        - Sin cursor: offset clásico por compatibilidad.
+        Devuelve (torneos, next_cursor). El conteo de inscritos viene de registered_teams.
         """
         query = (
             select(Tournament)
-            .options(selectinload(Tournament.registrations))  # Vital para el conteo
-            .order_by(Tournament.start_date.desc())  # Ordenamos por fecha
-            .offset(skip)
+            .order_by(Tournament.start_date.desc(), Tournament.id.desc())  # id desempata fechas iguales
             .limit(limit)
         )
+        if status is not None:
+            query = query.where(Tournament.status == status)
+        if category is not None:
+            query = query.where(Tournament.category == category)
+
+        if cursor:
+            last_date, last_id = decode_cursor(cursor, datetime.fromisoformat, UUID)
+            query = query.where(tuple_(Tournament.start_date, Tournament.id) < (last_date, last_id))
+        else:
+            query = query.offset(skip)
+
         result = await db.execute(query)
-        return result.scalars().all()
+        tournaments = result.scalars().all()
+
+        next_cursor = None
+        if tournaments and len(tournaments) == limit:
+            last = tournaments[-1]
+            next_cursor = encode_cursor(last.start_date.isoformat(), last.id)
+        return tournaments, next_cursor
 
     @staticmethod
     async def get_tournament_by_id(db: AsyncSession, tournament_id: UUID):
@@ -64,7 +134,6 @@ class TournamentService:
         query = (
             select(Tournament)
             .where(Tournament.id == tournament_id)
-            .options(selectinload(Tournament.registrations))
         )
         result = await db.execute(query)
         tournament = result.scalars().first()
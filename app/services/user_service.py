@@ -1,11 +1,34 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import update
+from sqlalchemy import update, inspect
+from sqlalchemy.orm import make_transient_to_detached
 from fastapi import HTTPException, status
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.notification_hub import notification_hub
 from app.models.user import User
 from app.schemas.user import UserOnboarding, UserUpdate
+from typing import Optional
 from uuid import UUID
 
+# user_id -> snapshot de columnas del usuario autenticado (evita el SELECT en cada request)
+_principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+PRINCIPAL_INVALIDATION_NAME = "principals"
+
+
+def _invalidate_principals(user_ids: Optional[list[str]]):
+    if user_ids is None:
+        _principal_cache.clear()
+        return
+    for user_id in user_ids:
+        _principal_cache.delete(user_id)
+
+
+notification_hub.on_invalidate(PRINCIPAL_INVALIDATION_NAME, _invalidate_principals)
+
 
 class UserService:
     @staticmethod
@@ -13,6 +36,35 @@ class UserService:
         result = await db.execute(select(User).where(User.id == user_id))
         return result.scalars().first()
 
+    @staticmethod
+    async def get_principal(db: AsyncSession, user_id: UUID):
+        """
+        Igual que get_user_by_id pero servido desde la caché de sesión.
+        En un hit se reconstruye el User y se adjunta a la sesión sin consultar la DB.
+        """
+        key = str(user_id)
+        snapshot = _principal_cache.get(key)
+        if snapshot is not None:
+            user = User(**snapshot)
+            make_transient_to_detached(user)
+            db.add(user)
+            return user
+
+        user = await UserService.get_user_by_id(db, user_id)
+        if user:
+            _principal_cache.set(key, {
+                attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs
+            })
+        return user
+
+    @staticmethod
+    def invalidate_principal(user_id: UUID):
+        """
+        Debe llamarse después de cualquier cambio en el perfil o rol del usuario.
+        Se difunde a los demás workers, que también tienen su copia en caché.
+        """
+        notification_hub.invalidate(PRINCIPAL_INVALIDATION_NAME, [str(user_id)])
+
     @staticmethod
     async def check_nick_exists(db: AsyncSession, nick: str) -> bool:
         result = await db.execute(select(User).where(User.internal_nick == nick))
@@ -41,6 +93,7 @@ class UserService:
         )
         await db.execute(query)
         await db.commit()
+        UserService.invalidate_principal(user_id)
 
         # Retornar usuario actualizado
         return await UserService.get_user_by_id(db, user_id)
@@ -69,5 +122,6 @@ class UserService:
             query_update = update(User).where(User.id == user_id).values(**update_data)
             await db.execute(query_update)
             await db.commit()
+            UserService.invalidate_principal(user_id)
 
         return await UserService.get_user_by_id(db, user_id)
\ No newline at end of file
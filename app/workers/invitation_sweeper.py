@@ -0,0 +1,33 @@
+"""
+Worker que vence las invitaciones PENDING expiradas y limpia sus notificaciones.
+
+Uso:
+    python -m app.workers.invitation_sweeper          # bucle cada INVITATION_SWEEP_INTERVAL_SECONDS
+    python -m app.workers.invitation_sweeper --once   # una sola pasada
+
+Se pueden levantar varias instancias: el advisory lock deja trabajar solo a una.
+"""
+import argparse
+import asyncio
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.services.invitation_service import InvitationService
+
+
+async def run(once: bool):
+    while True:
+        async with AsyncSessionLocal() as db:
+            stats = await InvitationService.expire_invitations(db)
+        print(f"Pasada completa: {stats}")
+
+        if once:
+            break
+        await asyncio.sleep(settings.INVITATION_SWEEP_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vence invitaciones expiradas y borra sus notificaciones")
+    parser.add_argument("--once", action="store_true", help="Ejecuta una sola pasada y termina")
+    args = parser.parse_args()
+    asyncio.run(run(args.once))
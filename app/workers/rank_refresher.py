@@ -0,0 +1,41 @@
+"""
+Worker que mantiene frescos los rangos de todas las cuentas vinculadas.
+
+Uso:
+    python -m app.workers.rank_refresher            # bucle cada RANK_REFRESH_INTERVAL_SECONDS
+    python -m app.workers.rank_refresher --once     # una sola pasada
+    python -m app.workers.rank_refresher --once --start-after <uuid>
+"""
+import argparse
+import asyncio
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.services.rank_service import RankService
+from app.services.riot_service import RiotService
+
+
+async def run(once: bool, start_after: UUID | None):
+    await RiotService.startup()
+    try:
+        while True:
+            async with AsyncSessionLocal() as db:
+                stats = await RankService.refresh_stale_accounts(db, start_after=start_after)
+            print(f"Pasada completa: {stats}")
+
+            if once:
+                break
+            # Las siguientes pasadas recorren la tabla completa de nuevo
+            start_after = None
+            await asyncio.sleep(settings.RANK_REFRESH_INTERVAL_SECONDS)
+    finally:
+        await RiotService.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresca los rangos de las cuentas de Riot vinculadas")
+    parser.add_argument("--once", action="store_true", help="Ejecuta una sola pasada y termina")
+    parser.add_argument("--start-after", type=UUID, default=None, help="Retoma después de este id de cuenta")
+    args = parser.parse_args()
+    asyncio.run(run(args.once, args.start_after))
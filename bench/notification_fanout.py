@@ -0,0 +1,166 @@
+"""
+Escritura de N notificaciones en Postgres: ORM fila por fila vs. escritura por conjuntos.
+
+- orm:         db.add(Notification(...)) por destinatario + flush + publish (como antes)
+- create_many: NotificationService.create_many (INSERT ... SELECT FROM unnest(un arreglo por columna)
+               + pg_notify desde unnest(arreglo de payloads): sentencias cacheables)
+- fan_out:     NotificationService.fan_out_tournament (INSERT ... SELECT ... RETURNING + pg_notify)
+
+Cada corrida incluye el commit (ahí Postgres encola los NOTIFY) y espera a que un LISTEN
+reciba todos los mensajes. Requiere DATABASE_URL apuntando a un Postgres migrado.
+
+    python -m bench.notification_fanout --recipients 10000 --repeat 3
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+os.environ.setdefault("DATABASE_URL", "")
+if not os.environ["DATABASE_URL"].startswith("postgresql+asyncpg"):
+    sys.exit("DATABASE_URL debe apuntar a un Postgres migrado (postgresql+asyncpg://...)")
+for _name in ("SECRET_KEY", "RIOT_API_KEY", "GOOGLE_CLIENT_ID", "GOOGLE_CLIENT_SECRET", "GOOGLE_REDIRECT_URI"):
+    os.environ.setdefault(_name, "bench")
+
+import asyncpg  # noqa: E402
+from sqlalchemy import delete, insert  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.notification_hub import notification_hub  # noqa: E402
+from app.models.notification import Notification, NotificationCounter  # noqa: E402
+from app.models.team import Team, TeamMember  # noqa: E402
+from app.models.tournament import Registration, Tournament  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.notification_service import NotificationService  # noqa: E402
+
+TEAM_SIZE = 5
+
+
+class Listener:
+    """Cuenta los NOTIFY recibidos para medir hasta la entrega, no solo hasta el commit"""
+
+    def __init__(self):
+        self.received = 0
+        self.target = 0
+        self.done = asyncio.Event()
+
+    def expect(self, count: int):
+        self.received, self.target = 0, count
+        self.done.clear()
+
+    def __call__(self, connection, pid, channel, payload):
+        self.received += 1
+        if self.received >= self.target:
+            self.done.set()
+
+
+async def run_orm(Session, users, tournament_id):
+    async with Session() as db:
+        notifications = [
+            Notification(user_id=u, type="BENCH", title="bench", message="bench", data={"tournament_id": str(tournament_id)})
+            for u in users
+        ]
+        db.add_all(notifications)
+        await db.flush()
+        await notification_hub.publish(db, notifications)
+        await db.commit()
+
+
+async def run_create_many(Session, users, tournament_id):
+    async with Session() as db:
+        rows = [
+            NotificationService.build(u, "BENCH", "bench", "bench", data={"tournament_id": str(tournament_id)})
+            for u in users
+        ]
+        await NotificationService.create_many(db, rows)
+        await db.commit()
+
+
+async def run_fan_out(Session, users, tournament_id):
+    async with Session() as db:
+        await NotificationService.fan_out_tournament(
+            db, tournament_id, "BENCH", "bench", "bench", data={"tournament_id": str(tournament_id)}
+        )
+        await db.commit()
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--recipients", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = create_async_engine(os.environ["DATABASE_URL"])
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+
+    # Torneo con N destinatarios: equipos de TEAM_SIZE integrantes, todos verificados
+    tournament_id = uuid.uuid4()
+    users = [uuid.uuid4() for _ in range(args.recipients)]
+    teams = [uuid.uuid4() for _ in range(0, args.recipients, TEAM_SIZE)]
+    tags = [format(i, "05x") for i in random.sample(range(16 ** 5), len(teams))]
+    now = datetime.now(timezone.utc)
+    async with Session() as db:
+        db.add(Tournament(id=tournament_id, name=f"bench-{tournament_id}", category="Bench", start_date=now))
+        await db.execute(insert(User), [{"id": u, "email": f"{u}@bench.local"} for u in users])
+        await db.execute(insert(Team), [
+            {"id": t, "name": f"bench-{t}", "tag": tag, "captain_id": users[i * TEAM_SIZE]}
+            for i, (t, tag) in enumerate(zip(teams, tags))
+        ])
+        await db.execute(insert(TeamMember), [
+            {"id": uuid.uuid4(), "team_id": teams[i // TEAM_SIZE], "user_id": u, "joined_at": now}
+            for i, u in enumerate(users)
+        ])
+        await db.execute(insert(Registration), [
+            {"id": uuid.uuid4(), "tournament_id": tournament_id, "team_id": t, "payment_status": "verified"}
+            for t in teams
+        ])
+        await db.commit()
+
+    dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+    listener = Listener()
+    connection = await asyncpg.connect(dsn)
+    await connection.add_listener(settings.NOTIFICATION_CHANNEL, listener)
+
+    results = {}
+    try:
+        for name, run in (("orm", run_orm), ("create_many", run_create_many), ("fan_out", run_fan_out)):
+            timings = []
+            for _ in range(args.repeat):
+                listener.expect(len(users))
+                started = time.perf_counter()
+                await run(Session, users, tournament_id)
+                await asyncio.wait_for(listener.done.wait(), timeout=120)
+                timings.append(time.perf_counter() - started)
+
+                async with Session() as db:
+                    await db.execute(delete(Notification).where(Notification.user_id.in_(users)))
+                    await db.commit()
+            results[name] = timings
+            print(f"{name:12} mediana {statistics.median(timings) * 1000:7.0f} ms, "
+                  f"mejor {min(timings) * 1000:7.0f} ms ({len(users)} notificaciones)")
+
+        base = statistics.median(results["orm"])
+        for name in ("create_many", "fan_out"):
+            print(f"{name} vs orm: {base / statistics.median(results[name]):.1f}x")
+    finally:
+        await connection.close()
+        async with Session() as db:
+            await db.execute(delete(Notification).where(Notification.user_id.in_(users)))
+            await db.execute(delete(NotificationCounter).where(NotificationCounter.user_id.in_(users)))
+            await db.execute(delete(Registration).where(Registration.tournament_id == tournament_id))
+            await db.execute(delete(TeamMember).where(TeamMember.team_id.in_(teams)))
+            await db.execute(delete(Team).where(Team.id.in_(teams)))
+            await db.execute(delete(User).where(User.id.in_(users)))
+            await db.execute(delete(Tournament).where(Tournament.id == tournament_id))
+            await db.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,181 @@
+"""
+Carga de conexiones SSE ociosas contra un worker real de uvicorn.
+
+Levanta app.main con un solo worker, abre N conexiones a /api/v1/notifications/stream
+(un usuario distinto por conexión), mide la memoria residente del worker (VmRSS, Linux)
+antes y después y, al final, publica una notificación por usuario con
+NotificationService.create_many para medir la entrega por LISTEN/NOTIFY.
+
+Requiere DATABASE_URL apuntando a un Postgres migrado (postgresql+asyncpg://...) y un
+límite de descriptores mayor al número de conexiones (ulimit -n).
+
+    python -m bench.sse_idle_connections --connections 10000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+
+os.environ.setdefault("DATABASE_URL", "")
+if not os.environ["DATABASE_URL"].startswith("postgresql+asyncpg"):
+    sys.exit("DATABASE_URL debe apuntar a un Postgres migrado (postgresql+asyncpg://...)")
+# Estos valores los hereda también el worker (el token se firma con el mismo SECRET_KEY)
+for _name in ("SECRET_KEY", "RIOT_API_KEY", "GOOGLE_CLIENT_ID", "GOOGLE_CLIENT_SECRET", "GOOGLE_REDIRECT_URI"):
+    os.environ.setdefault(_name, "bench")
+
+from sqlalchemy import delete, insert  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from app.core.security import create_access_token  # noqa: E402
+from app.models.notification import Notification, NotificationCounter  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.notification_service import NotificationService  # noqa: E402
+
+HOST = "127.0.0.1"
+
+
+def rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+class Client:
+    """Conexión SSE cruda (sin httpx) para que el costo del cliente no distorsione la prueba"""
+
+    def __init__(self, port: int, token: str):
+        self.port = port
+        self.token = token
+        self.ready = asyncio.Event()
+        self.delivered_at = None
+        self.delivered = asyncio.Event()
+        self.writer = None
+
+    async def run(self):
+        reader, self.writer = await asyncio.open_connection(HOST, self.port)
+        self.writer.write(
+            f"GET /api/v1/notifications/stream?token={self.token} HTTP/1.1\r\n"
+            f"Host: {HOST}\r\nAccept: text/event-stream\r\n\r\n".encode()
+        )
+        await self.writer.drain()
+        status = await reader.readline()
+        if b" 200 " not in status:
+            raise RuntimeError(f"Respuesta inesperada: {status!r}")
+        async for line in reader:
+            if b"retry:" in line:
+                self.ready.set()
+            elif b"data:" in line and self.delivered_at is None:
+                self.delivered_at = time.perf_counter()
+                self.delivered.set()
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+async def open_clients(port: int, tokens: list[str], batch: int) -> tuple[list[Client], list[asyncio.Task]]:
+    clients, tasks = [], []
+    for start in range(0, len(tokens), batch):
+        chunk = [Client(port, token) for token in tokens[start:start + batch]]
+        tasks += [asyncio.create_task(c.run()) for c in chunk]
+        await asyncio.wait_for(asyncio.gather(*(c.ready.wait() for c in chunk)), timeout=60)
+        clients += chunk
+        print(f"  {len(clients)} conexiones abiertas", end="\r", flush=True)
+    print()
+    return clients, tasks
+
+
+async def wait_for_server(port: int, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection(HOST, port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError("El worker no arrancó a tiempo")
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--connections", type=int, default=10000)
+    parser.add_argument("--batch", type=int, default=500, help="Conexiones abiertas a la vez")
+    parser.add_argument("--hold", type=float, default=30, help="Segundos ociosos antes de medir de nuevo")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    engine = create_async_engine(os.environ["DATABASE_URL"])
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    users = [uuid.uuid4() for _ in range(args.connections + 1)]
+    async with Session() as db:
+        await db.execute(insert(User), [{"id": u, "email": f"{u}@bench.local"} for u in users])
+        await db.commit()
+    tokens = [create_access_token(str(u)) for u in users]
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", HOST, "--port", str(args.port),
+         "--log-level", "warning", "--backlog", "4096"],
+        stdout=subprocess.DEVNULL
+    )
+    clients, tasks = [], []
+    try:
+        await wait_for_server(args.port)
+
+        # Calentamiento: la primera conexión carga rutas, pool y LISTEN
+        warm, warm_tasks = await open_clients(args.port, tokens[:1], 1)
+        warm[0].close()
+        tasks += warm_tasks
+        await asyncio.sleep(1)
+        baseline = rss_mb(server.pid)
+
+        started = time.perf_counter()
+        clients, idle_tasks = await open_clients(args.port, tokens[1:], args.batch)
+        tasks += idle_tasks
+        opened = time.perf_counter() - started
+        loaded = rss_mb(server.pid)
+        await asyncio.sleep(args.hold)
+        held = rss_mb(server.pid)
+
+        per_connection = (held - baseline) * 1024 / len(clients)
+        print(f"Conexiones: {len(clients)} abiertas en {opened:.1f} s")
+        print(f"RSS del worker: base {baseline:.1f} MB, con conexiones {loaded:.1f} MB, "
+              f"tras {args.hold:.0f} s ociosas {held:.1f} MB ({per_connection:.1f} KB/conexión)")
+
+        # Entrega: una notificación por usuario, un INSERT ... SELECT FROM unnest(...) + NOTIFY al commit
+        rows = [NotificationService.build(u, "BENCH", "bench", "bench") for u in users[1:]]
+        async with Session() as db:
+            await NotificationService.create_many(db, rows)
+            published = time.perf_counter()
+            await db.commit()
+        await asyncio.wait_for(asyncio.gather(*(c.delivered.wait() for c in clients)), timeout=120)
+        latencies = sorted((c.delivered_at - published) * 1000 for c in clients)
+        print(
+            f"Entrega a {len(clients)} conexiones: p50 {statistics.median(latencies):.0f} ms, "
+            f"p99 {latencies[int(len(latencies) * 0.99) - 1]:.0f} ms, máx {latencies[-1]:.0f} ms; "
+            f"RSS {rss_mb(server.pid):.1f} MB"
+        )
+    finally:
+        for client in clients:
+            client.close()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        server.terminate()
+        server.wait()
+        async with Session() as db:
+            await db.execute(delete(Notification).where(Notification.user_id.in_(users)))
+            await db.execute(delete(NotificationCounter).where(NotificationCounter.user_id.in_(users)))
+            await db.execute(delete(User).where(User.id.in_(users)))
+            await db.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,57 @@
+"""
+Benchmark del emparejamiento suizo: N equipos x R rondas con resultados aleatorios.
+Mide compute_standings + pair por ronda (el trabajo en Python/NumPy de generate_round,
+sin la base de datos).
+
+    python -m bench.swiss_pairing --teams 256 --rounds 9
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+# SwissService importa la configuración de la app; para este benchmark no se usa la DB
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/unused")
+for _name in ("SECRET_KEY", "RIOT_API_KEY", "GOOGLE_CLIENT_ID", "GOOGLE_CLIENT_SECRET", "GOOGLE_REDIRECT_URI"):
+    os.environ.setdefault(_name, "bench")
+
+from app.services.swiss_service import SwissService  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--teams", type=int, default=256)
+    parser.add_argument("--rounds", type=int, default=9)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    team_a = np.empty(0, dtype=np.int64)
+    team_b = np.empty(0, dtype=np.int64)
+    winner = np.empty(0, dtype=np.int64)
+    timings = []
+
+    for round_number in range(1, args.rounds + 1):
+        started = time.perf_counter()
+        order, _, _, _, played, had_bye = SwissService.compute_standings(args.teams, team_a, team_b, winner)
+        pairs, bye = SwissService.pair(order, played, had_bye)
+        timings.append(time.perf_counter() - started)
+
+        # Resultados aleatorios; el bye es una victoria directa
+        a = np.array([p[0] for p in pairs], dtype=np.int64)
+        b = np.array([p[1] for p in pairs], dtype=np.int64)
+        w = np.where(rng.random(len(pairs)) < 0.5, a, b)
+        if bye is not None:
+            a, b, w = np.append(a, bye), np.append(b, -1), np.append(w, bye)
+        team_a, team_b, winner = np.concatenate([team_a, a]), np.concatenate([team_b, b]), np.concatenate([winner, w])
+        print(f"Ronda {round_number}: {len(pairs)} partidos en {timings[-1] * 1000:.2f} ms")
+
+    print(
+        f"{args.teams} equipos x {args.rounds} rondas: total {sum(timings) * 1000:.1f} ms, "
+        f"peor ronda {max(timings) * 1000:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
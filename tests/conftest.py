@@ -0,0 +1,19 @@
+import os
+
+import pytest
+
+# Las pruebas contra Postgres usan DATABASE_URL (migrada con `alembic upgrade head`)
+# y se saltan si no apunta a uno.
+POSTGRES_URL = os.getenv("DATABASE_URL", "")
+
+# Valores mínimos para que app.core.config cargue sin .env
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/vortex_test")
+for _name in ("SECRET_KEY", "RIOT_API_KEY", "GOOGLE_CLIENT_ID", "GOOGLE_CLIENT_SECRET", "GOOGLE_REDIRECT_URI"):
+    os.environ.setdefault(_name, "test")
+
+
+@pytest.fixture
+def postgres_url() -> str:
+    if not POSTGRES_URL.startswith("postgresql+asyncpg"):
+        pytest.skip("DATABASE_URL no apunta a un Postgres (postgresql+asyncpg://...)")
+    return POSTGRES_URL
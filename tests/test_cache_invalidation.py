@@ -0,0 +1,70 @@
+import asyncio
+import uuid
+
+from sqlalchemy.engine import make_url
+
+from app.core.notification_hub import NotificationHub
+
+
+class Recorder:
+    """Caché de prueba: anota cada invalidación recibida"""
+
+    def __init__(self):
+        self.calls = []
+        self.changed = asyncio.Event()
+
+    def __call__(self, keys):
+        self.calls.append(keys)
+        self.changed.set()
+
+
+def test_invalidate_without_listener_is_local():
+    hub = NotificationHub("test_notifications", "test_invalidation")
+    recorder = Recorder()
+    hub.on_invalidate("cache", recorder)
+
+    hub.invalidate("cache", ["a", "b"])
+
+    assert recorder.calls == [["a", "b"]]
+    assert hub._outbox.empty()
+
+
+def test_invalidate_reaches_other_workers(postgres_url):
+    """Dos hubs con su propio LISTEN hacen de dos workers de uvicorn"""
+    async def main():
+        dsn = make_url(postgres_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        suffix = uuid.uuid4().hex[:8]
+        workers = [NotificationHub(f"test_notifications_{suffix}", f"test_invalidation_{suffix}") for _ in range(2)]
+        recorders = [Recorder() for _ in workers]
+        for hub, recorder in zip(workers, recorders):
+            hub.on_invalidate("cache", recorder)
+            await hub.start(dsn)
+
+        try:
+            # Al conectar cada worker vacía su caché: pudo perder avisos mientras no escuchaba
+            for recorder in recorders:
+                await asyncio.wait_for(recorder.changed.wait(), timeout=10)
+                assert recorder.calls == [None]
+                recorder.calls.clear()
+                recorder.changed.clear()
+
+            sender, receiver = workers
+            keys = [f"tournament:{uuid.uuid4()}" for _ in range(250)]
+            sender.invalidate("cache", keys)
+            assert recorders[0].calls == [keys]
+
+            async def received():
+                while sum(len(call) for call in recorders[1].calls) < len(keys):
+                    await recorders[1].changed.wait()
+                    recorders[1].changed.clear()
+
+            await asyncio.wait_for(received(), timeout=10)
+            assert [key for call in recorders[1].calls for key in call] == keys
+            # Sin eco: el emisor no vuelve a aplicar su propio aviso
+            await asyncio.sleep(0.2)
+            assert recorders[0].calls == [keys]
+        finally:
+            for hub in workers:
+                await hub.stop()
+
+    asyncio.run(main())
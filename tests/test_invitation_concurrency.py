@@ -0,0 +1,78 @@
+import asyncio
+import secrets
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.invitation import InvitationStatus, TeamInvitation
+from app.models.team import Team, TeamMember
+from app.models.user import User
+from app.services.invitation_service import InvitationService
+
+USERS = 50
+INVITES_PER_USER = 2  # 100 aceptaciones: cada usuario acepta dos invitaciones a la vez
+
+
+def test_concurrent_accepts_respect_member_cap(postgres_url):
+    async def main():
+        engine = create_async_engine(postgres_url, pool_size=40, max_overflow=40)
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        captain_id, team_id = uuid.uuid4(), uuid.uuid4()
+        users = [uuid.uuid4() for _ in range(USERS)]
+        expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+        invites = [
+            {
+                "id": uuid.uuid4(), "team_id": team_id, "inviter_id": captain_id, "invitee_id": u,
+                "token": secrets.token_urlsafe(16), "status": InvitationStatus.PENDING, "expires_at": expires_at
+            }
+            for u in users for _ in range(INVITES_PER_USER)
+        ]
+
+        async with Session() as db:
+            await db.execute(insert(User), [{"id": u, "email": f"{u}@test.local"} for u in [captain_id, *users]])
+            db.add(Team(id=team_id, name=f"cap-{team_id}", tag=team_id.hex[:5], captain_id=captain_id))
+            await db.flush()
+            db.add(TeamMember(team_id=team_id, user_id=captain_id))
+            await db.execute(insert(TeamInvitation), invites)
+            await db.commit()
+
+        async def accept(invite):
+            async with Session() as db:
+                return await InvitationService.accept_invitation(db, invite["token"], invite["invitee_id"])
+
+        try:
+            results = await asyncio.gather(*(accept(i) for i in invites), return_exceptions=True)
+            accepted = [r for r in results if not isinstance(r, BaseException)]
+            unexpected = [
+                r for r in results
+                if isinstance(r, BaseException) and not (isinstance(r, HTTPException) and r.status_code == 400)
+            ]
+            assert not unexpected, unexpected[:3]
+
+            async with Session() as db:
+                members = (await db.execute(
+                    select(TeamMember.user_id).where(TeamMember.team_id == team_id)
+                )).scalars().all()
+                accepted_invites = (await db.execute(
+                    select(func.count()).select_from(TeamInvitation).where(
+                        TeamInvitation.team_id == team_id,
+                        TeamInvitation.status == InvitationStatus.ACCEPTED
+                    )
+                )).scalar_one()
+
+            assert len(members) == InvitationService.MAX_MEMBERS
+            assert len(set(members)) == len(members)
+            assert len(accepted) == accepted_invites == InvitationService.MAX_MEMBERS - 1
+        finally:
+            async with Session() as db:
+                await db.execute(delete(TeamMember).where(TeamMember.team_id == team_id))
+                await db.execute(delete(TeamInvitation).where(TeamInvitation.team_id == team_id))
+                await db.execute(delete(Team).where(Team.id == team_id))
+                await db.execute(delete(User).where(User.id.in_([captain_id, *users])))
+                await db.commit()
+            await engine.dispose()
+
+    asyncio.run(main())
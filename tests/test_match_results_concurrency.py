@@ -0,0 +1,86 @@
+import asyncio
+import random
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.match import Game, Match, MatchStatus
+from app.models.team import Team
+from app.models.tournament import Tournament
+from app.models.user import User
+from app.schemas.match import GameResult
+from app.services.match_service import MatchService
+
+
+def test_same_riot_game_on_two_series_is_recorded_once(postgres_url):
+    """
+    Dos envíos con el mismo riot_game_id para series distintas no comparten lock de
+    serie: el segundo debe esperar al primero y marcar el mapa como "duplicate"
+    """
+    async def main():
+        engine = create_async_engine(postgres_url)
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        captain_id, tournament_id = uuid.uuid4(), uuid.uuid4()
+        team_a, team_b = uuid.uuid4(), uuid.uuid4()
+        first, second = uuid.uuid4(), uuid.uuid4()
+        riot_game_id = f"TEST_{uuid.uuid4().hex}"
+
+        async with Session() as db:
+            db.add(User(id=captain_id, email=f"{captain_id}@test.local"))
+            db.add(Tournament(
+                id=tournament_id, name=f"games-{tournament_id}", category="Test",
+                start_date=datetime.now(timezone.utc)
+            ))
+            await db.flush()
+            await db.execute(insert(Team), [
+                {"id": t, "name": f"games-{t}", "tag": format(i, "05x"), "captain_id": captain_id}
+                for t, i in zip((team_a, team_b), random.sample(range(16 ** 5), 2))
+            ])
+            await db.execute(insert(Match), [
+                {
+                    "id": m, "tournament_id": tournament_id, "round_number": 1, "bracket_position": i,
+                    "team_a_id": team_a, "team_b_id": team_b, "match_type": "BO3",
+                    "status": MatchStatus.PENDING_CONFIRMATION
+                }
+                for i, m in enumerate((first, second))
+            ])
+            await db.commit()
+
+        try:
+            # Otro envío inserta el mapa en la primera serie y todavía no confirma
+            async with Session() as other:
+                other.add(Game(match_id=first, riot_game_id=riot_game_id, winner_team_id=team_a))
+                await other.flush()
+
+                async def record():
+                    async with Session() as db:
+                        return await MatchService.record_games(
+                            db, [GameResult(match_id=second, winner_team_id=team_a, riot_game_id=riot_game_id)]
+                        )
+
+                task = asyncio.create_task(record())
+                await asyncio.sleep(0.5)
+                assert not task.done()
+                await other.commit()
+
+            outcomes = await asyncio.wait_for(task, timeout=10)
+            assert [o.status for o in outcomes] == ["duplicate"]
+
+            async with Session() as db:
+                games = (await db.execute(select(Game.match_id).where(Game.riot_game_id == riot_game_id))).all()
+                status = (await db.execute(select(Match.status).where(Match.id == second))).scalar_one()
+            assert games == [(first,)]
+            assert status == MatchStatus.PENDING_CONFIRMATION
+        finally:
+            async with Session() as db:
+                await db.execute(delete(Game).where(Game.match_id.in_([first, second])))
+                await db.execute(delete(Match).where(Match.id.in_([first, second])))
+                await db.execute(delete(Team).where(Team.id.in_([team_a, team_b])))
+                await db.execute(delete(Tournament).where(Tournament.id == tournament_id))
+                await db.execute(delete(User).where(User.id == captain_id))
+                await db.commit()
+            await engine.dispose()
+
+    asyncio.run(main())
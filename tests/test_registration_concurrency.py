@@ -0,0 +1,105 @@
+import asyncio
+import random
+import uuid
+from datetime import datetime, timezone
+
+from fastapi import HTTPException
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.notification import Notification, NotificationCounter
+from app.models.team import Team
+from app.models.tournament import Registration, Tournament, TournamentStatus
+from app.models.user import User
+from app.services.registration_service import RegistrationService
+
+TEAMS = 500
+MAX_TEAMS = 16
+
+
+def test_concurrent_registrations_never_exceed_max_teams(postgres_url):
+    async def main():
+        # Hasta 80 conexiones a la vez; el resto de registros espera turno en el pool
+        engine = create_async_engine(postgres_url, pool_size=40, max_overflow=40)
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        tournament_id = uuid.uuid4()
+        captains = [uuid.uuid4() for _ in range(TEAMS)]
+        teams = [uuid.uuid4() for _ in range(TEAMS)]
+
+        async with Session() as db:
+            db.add(Tournament(
+                id=tournament_id, name=f"race-{tournament_id}", category="Open", max_teams=MAX_TEAMS,
+                status=TournamentStatus.WAITING, start_date=datetime.now(timezone.utc)
+            ))
+            await db.execute(insert(User), [{"id": u, "email": f"{u}@test.local"} for u in captains])
+            # Team.tag es String(5) y único: tags distintos en vez de recortar el uuid
+            tags = [format(i, "05x") for i in random.sample(range(16 ** 5), TEAMS)]
+            await db.execute(insert(Team), [
+                {"id": t, "name": f"race-{t}", "tag": tag, "captain_id": u}
+                for t, u, tag in zip(teams, captains, tags)
+            ])
+            await db.commit()
+
+        async def register(team_id, captain_id):
+            async with Session() as db:
+                return await RegistrationService.register_team(db, tournament_id, team_id, captain_id)
+
+        try:
+            results = await asyncio.gather(
+                *(register(t, u) for t, u in zip(teams, captains)), return_exceptions=True
+            )
+            errors = [r for r in results if isinstance(r, BaseException)]
+            assert not errors, errors[:3]
+
+            async with Session() as db:
+                statuses = (await db.execute(
+                    select(Registration.payment_status).where(Registration.tournament_id == tournament_id)
+                )).scalars().all()
+                registered_teams = (await db.execute(
+                    select(Tournament.registered_teams).where(Tournament.id == tournament_id)
+                )).scalar_one()
+
+            assert len(statuses) == TEAMS
+            assert statuses.count("pending") == MAX_TEAMS
+            assert statuses.count(RegistrationService.WAITLISTED) == TEAMS - MAX_TEAMS
+            assert registered_teams == MAX_TEAMS
+
+            # Reinscribir un equipo choca con la restricción única y no toma cupo
+            async with Session() as db:
+                try:
+                    await RegistrationService.register_team(db, tournament_id, teams[0], captains[0])
+                except HTTPException as e:
+                    assert e.status_code == 409
+                else:
+                    raise AssertionError("Se permitió una inscripción duplicada")
+
+            # Un equipo rechazado se reinscribe sobre su misma fila, al final de la lista de espera
+            async with Session() as db:
+                rejected = (await db.execute(
+                    select(Registration).where(
+                        Registration.tournament_id == tournament_id,
+                        Registration.payment_status == "pending"
+                    ).limit(1)
+                )).scalars().one()
+                await RegistrationService.reject_registration(db, rejected.id)
+            captain = captains[teams.index(rejected.team_id)]
+            async with Session() as db:
+                again = await RegistrationService.register_team(db, tournament_id, rejected.team_id, captain)
+                registered_teams = (await db.execute(
+                    select(Tournament.registered_teams).where(Tournament.id == tournament_id)
+                )).scalar_one()
+            assert again.id == rejected.id
+            assert again.payment_status == RegistrationService.WAITLISTED
+            assert registered_teams == MAX_TEAMS
+        finally:
+            async with Session() as db:
+                await db.execute(delete(Notification).where(Notification.user_id.in_(captains)))
+                await db.execute(delete(NotificationCounter).where(NotificationCounter.user_id.in_(captains)))
+                await db.execute(delete(Registration).where(Registration.tournament_id == tournament_id))
+                await db.execute(delete(Team).where(Team.id.in_(teams)))
+                await db.execute(delete(User).where(User.id.in_(captains)))
+                await db.execute(delete(Tournament).where(Tournament.id == tournament_id))
+                await db.commit()
+            await engine.dispose()
+
+    asyncio.run(main())
@@ -0,0 +1,29 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.services.riot_service import RiotService
+
+
+def _mock_client(monkeypatch, response: httpx.Response):
+    transport = httpx.MockTransport(lambda request: response)
+    client = httpx.AsyncClient(base_url="https://la1.api.riotgames.com", transport=transport)
+    monkeypatch.setitem(RiotService._clients, "la1", client)
+
+
+@pytest.mark.parametrize("status_code", [200, 502])
+def test_non_json_body_becomes_http_exception(monkeypatch, status_code):
+    _mock_client(monkeypatch, httpx.Response(status_code, text="<html>Bad Gateway</html>"))
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(RiotService.get_rank_data_by_puuid("LAN", "puuid"))
+    assert exc.value.status_code == 502
+
+
+def test_json_body_is_returned(monkeypatch):
+    entries = [{"queueType": "RANKED_SOLO_5x5", "tier": "GOLD", "rank": "II"}]
+    _mock_client(monkeypatch, httpx.Response(200, json=entries))
+
+    assert asyncio.run(RiotService.get_rank_data_by_puuid("LAN", "puuid")) == entries
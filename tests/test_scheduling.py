@@ -0,0 +1,71 @@
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from app.models.match import SchedulingType
+from app.services.scheduling_service import SchedulingService, _TeamCalendar
+
+DAY = datetime(2026, 3, 1)
+
+
+def at(hour: float) -> datetime:
+    return DAY + timedelta(hours=hour)
+
+
+def make_match(team_a, team_b, match_type="BO1", scheduling_type=SchedulingType.FIXED):
+    return SimpleNamespace(
+        id=uuid.uuid4(), team_a_id=team_a, team_b_id=team_b, match_type=match_type,
+        scheduling_type=scheduling_type, round_number=1, bracket_position=0
+    )
+
+
+def test_overlapping_bookings_block_the_whole_span():
+    calendar = _TeamCalendar()
+    calendar.book(at(10), at(14))  # BO5 agendado a mano
+    calendar.book(at(11), at(12))  # BO1 que se solapa con el anterior
+
+    assert not calendar.is_free(at(12.5), at(13.5))
+    assert not calendar.is_free(at(9.5), at(10.5))
+    assert calendar.is_free(at(14), at(15))
+    assert calendar.is_free(at(9), at(10))
+    assert calendar.starts == [at(10)] and calendar.ends == [at(14)]
+
+
+def test_bookings_merge_across_several_intervals():
+    calendar = _TeamCalendar()
+    for start, end in ((1, 2), (3, 4), (5, 6)):
+        calendar.book(at(start), at(end))
+    calendar.book(at(1.5), at(5.5))
+
+    assert calendar.starts == [at(1)] and calendar.ends == [at(6)]
+    assert not calendar.is_free(at(4.5), at(4.8))
+
+
+def test_seeded_overlap_is_respected_by_placement():
+    team_x, team_y = uuid.uuid4(), uuid.uuid4()
+    calendars = defaultdict(_TeamCalendar)
+    calendars[team_x].book(at(10), at(14))
+    calendars[team_x].book(at(11), at(12))
+    match = make_match(team_x, team_y)
+
+    scheduled, unscheduled = SchedulingService._place(
+        [match], {match.id: []}, [at(12.5), at(14)], calendars
+    )
+    assert not unscheduled
+    assert scheduled[0].scheduled_at == at(14)
+
+
+def test_unconstrained_series_do_not_take_the_only_agreed_slot():
+    team_x, team_y, team_z = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    fixed = make_match(team_x, team_y)
+    negotiated = make_match(team_x, team_z, scheduling_type=SchedulingType.NEGOTIATED)
+    options = {fixed.id: [], negotiated.id: [at(20)]}
+
+    scheduled, unscheduled = SchedulingService._place(
+        [fixed, negotiated], options, [at(20), at(22)], defaultdict(_TeamCalendar)
+    )
+    by_match = {s.match_id: s for s in scheduled}
+    assert not unscheduled
+    assert (by_match[negotiated.id].scheduled_at, by_match[negotiated.id].source) == (at(20), "negotiated")
+    assert (by_match[fixed.id].scheduled_at, by_match[fixed.id].source) == (at(22), "default")
@@ -0,0 +1,49 @@
+import asyncio
+
+from app.core.singleflight import SingleFlight
+
+
+def test_cancelling_last_waiter_does_not_leak_to_next_caller():
+    async def main():
+        flight = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return calls
+
+        first = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        # Sin ceder el loop: la tarea compartida aún no terminó de cancelarse
+        second = asyncio.create_task(flight.do("key", fetch))
+
+        assert await second == 2
+        assert first.cancelled()
+        assert flight.in_flight() == 0
+
+    asyncio.run(main())
+
+
+def test_cancelling_one_waiter_keeps_shared_call():
+    async def main():
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "ok"
+
+        first = asyncio.create_task(flight.do("key", fetch))
+        second = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == "ok"
+        assert flight.in_flight() == 0
+
+    asyncio.run(main())
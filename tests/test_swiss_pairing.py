@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from app.services.swiss_service import PairingBudgetExceeded, SwissService
+
+
+def _empty(n: int):
+    return np.arange(n), np.zeros((n, n), dtype=bool), np.zeros(n, dtype=bool)
+
+
+def test_pairs_without_rematches():
+    order, played, had_bye = _empty(5)
+    played[0, 1] = played[1, 0] = True
+
+    pairs, bye = SwissService.pair(order, played, had_bye)
+    assert bye == 4
+    assert (0, 1) not in pairs and (1, 0) not in pairs
+    assert sorted(t for p in pairs for t in p) == [0, 1, 2, 3]
+
+
+def test_infeasible_round_raises_value_error():
+    order, played, had_bye = _empty(4)
+    played[0, 1:] = played[1:, 0] = True  # el líder ya enfrentó a todos
+
+    with pytest.raises(ValueError):
+        SwissService.pair(order, played, had_bye)
+
+
+def test_exhausted_budget_is_not_reported_as_infeasible(monkeypatch):
+    monkeypatch.setattr(SwissService, "PAIRING_BUDGET", 1)
+    order, played, had_bye = _empty(5)
+
+    with pytest.raises(PairingBudgetExceeded):
+        SwissService.pair(order, played, had_bye)
@@ -0,0 +1,10 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+@pytest.mark.parametrize("query", ["limit=0", "limit=-1", "limit=101", "skip=-1"])
+def test_out_of_range_pagination_is_rejected(query):
+    response = TestClient(app).get(f"/api/v1/tournaments/?{query}")
+    assert response.status_code == 422